@@ -0,0 +1,93 @@
+import argparse
+import json
+import platform
+import random
+from typing import Callable, Dict, List, Optional
+from grid_conquer.constants import BOARD_SIZE, GameState
+from benchmarks.unit_storage import build_position, microseconds_per_call
+
+# Games longer than this are cut off, so a pair of passive players cannot stall the benchmark
+MAX_GAME_PLIES = 400
+
+def play_random_game(seed: int) -> int:
+    """Play one game of uniformly random actions from the opening and return its length in plies."""
+    rng = random.Random(seed)
+    engine = build_position()
+    plies = 0
+    while engine.state != GameState.GAME_OVER and plies < MAX_GAME_PLIES:
+        actions = engine.legal_actions()
+        if actions:
+            engine.apply_action(rng.choice(actions))
+        else:
+            engine.end_turn()
+        plies += 1
+    return plies
+
+def benchmarks() -> Dict[str, Callable[[], object]]:
+    """Named zero-argument callables, each timed on its own."""
+    engine = build_position()
+    position = next(position for position, unit in engine.units.items()
+                    if unit.player == engine.current_player and unit.get_valid_moves(BOARD_SIZE, engine.units.keys()))
+    unit = engine.units[position]
+    occupied = engine.units.keys()
+
+    selecting = build_position()
+    selecting.select_unit(position)
+
+    playing = build_position()
+    action = playing.legal_actions()[0]
+
+    def apply_undo() -> None:
+        playing.apply_action(action)
+        playing.undo_action()
+
+    return {
+        'get_valid_moves': lambda: unit.get_valid_moves(BOARD_SIZE, occupied),
+        'update_valid_actions': selecting.update_valid_actions,
+        'check_game_over': engine.check_game_over,
+        'legal_actions': engine.legal_actions,
+        'apply_undo': apply_undo,
+        'random_game': lambda: play_random_game(0),
+    }
+
+def run(number: int, names: Optional[List[str]] = None) -> Dict[str, float]:
+    """Microseconds per call of every benchmark; full games run `number` // 1000 times."""
+    results = {}
+    for name, function in benchmarks().items():
+        if names and name not in names:
+            continue
+        calls = max(1, number // 1000) if name == 'random_game' else number
+        results[name] = microseconds_per_call(function, calls)
+    return results
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Time the engine's hot paths")
+    parser.add_argument('names', nargs='*', help="benchmarks to run (default: all)")
+    parser.add_argument('--number', type=int, default=10000, help="calls per timing run")
+    parser.add_argument('--json', default=None, help="write the results to this file")
+    parser.add_argument('--compare', default=None, help="results file from an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="slowdown flagged as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.number, args.names)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+    print(f"{'Benchmark':<24}{'us/call':>12}{'Baseline':>12}{'Change':>10}")
+    for name, microseconds in results.items():
+        line = f"{name:<24}{microseconds:>12.2f}"
+        if name in baseline:
+            change = microseconds / baseline[name] - 1
+            line += f"{baseline[name]:>12.2f}{change:>+10.1%}"
+            if change > args.tolerance:
+                line += "  REGRESSION"
+        print(line)
+
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump({'python': platform.python_version(), 'results': results}, json_file, indent=2)
+
+if __name__ == "__main__":
+    main()
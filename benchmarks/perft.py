@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from grid_conquer.constants import BOARD_SIZE, GameState, UnitType
+from grid_conquer.game_engine import GameEngine, SNAPSHOT_HEADER, SNAPSHOT_UNIT, SNAPSHOT_VERSION
+from benchmarks.unit_storage import build_position
+
+# Reference positions (GameEngine.to_bytes() snapshots in hex) with the
+# expected leaf counts at depth 1, 2, ...
+REFERENCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perft_reference.json')
+REFERENCE_VERSION = 1
+
+def perft(engine: GameEngine, depth: int) -> int:
+    """Number of legal action sequences `depth` plies long from this position.
+
+    Finished games and positions without legal actions have no successors,
+    so they only count when depth is 0. The last ply is counted from the
+    length of the action list instead of applying every action.
+    """
+    if depth == 0:
+        return 1
+    if engine.state == GameState.GAME_OVER:
+        return 0
+    actions = engine.legal_actions()
+    if depth == 1:
+        return len(actions)
+    nodes = 0
+    for action in actions:
+        engine.apply_action(action)
+        nodes += perft(engine, depth - 1)
+        engine.undo_action()
+    return nodes
+
+def divide(engine: GameEngine, depth: int) -> List[Tuple[str, int]]:
+    """perft() split by root action, for tracking down a mismatching count."""
+    counts = []
+    for unit, action_type, target in engine.legal_actions():
+        label = f"{unit.unit_type.name} {unit.position} {action_type} {target}"
+        engine.apply_action((unit, action_type, target))
+        counts.append((label, perft(engine, depth - 1)))
+        engine.undo_action()
+    return counts
+
+# A healer next to a wounded soldier, so heals are counted too
+ENDGAME_UNITS = [
+    (UnitType.CROWN, (3, 0), 1, 500), (UnitType.HEALER, (3, 3), 1, 110), (UnitType.SOLDIER, (4, 4), 1, 50),
+    (UnitType.CROWN, (4, 7), 2, 350), (UnitType.KNIGHT, (5, 5), 2, 150), (UnitType.WALL, (2, 5), 2, 150),
+]
+
+def reference_positions() -> Dict[str, GameEngine]:
+    """The positions the reference counts were taken from: the opening, a
+    middlegame reached by seeded random play and a small endgame."""
+    positions = {'opening': build_position()}
+    rng = random.Random(19)
+    engine = build_position()
+    for _ in range(24):
+        actions = engine.legal_actions()
+        engine.apply_action(rng.choice(actions))
+    positions['middlegame'] = GameEngine.from_bytes(engine.to_bytes())
+
+    units = [SNAPSHOT_UNIT.pack(unit_type << 2 | player, y * BOARD_SIZE + x, hp)
+             for unit_type, (x, y), player, hp in ENDGAME_UNITS]
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, GameState.PLAYER_1_TURN.value, 1, 0, len(units))
+    positions['endgame'] = GameEngine.from_bytes(header + b''.join(units))
+    return positions
+
+def load_reference(path: str = REFERENCE_PATH) -> Dict[str, dict]:
+    with open(path) as reference_file:
+        reference = json.load(reference_file)
+    if reference.get('version') != REFERENCE_VERSION:
+        raise ValueError(f"Unsupported perft reference version {reference.get('version')}")
+    return reference['positions']
+
+def write_reference(depth: int, path: str = REFERENCE_PATH) -> None:
+    """Recount every reference position up to `depth` and store the results."""
+    positions = {}
+    for name, engine in reference_positions().items():
+        positions[name] = {'snapshot': engine.to_bytes().hex(),
+                           'counts': [perft(engine, d) for d in range(1, depth + 1)]}
+    with open(path, 'w') as reference_file:
+        json.dump({'version': REFERENCE_VERSION, 'positions': positions}, reference_file, indent=2)
+        reference_file.write('\n')
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Count move-generation leaves and check them against stored references")
+    parser.add_argument('--depth', type=int, default=None, help="deepest level to count (default: every stored one)")
+    parser.add_argument('--position', action='append', default=None, help="only these reference positions")
+    parser.add_argument('--divide', action='store_true', help="print counts per root action at the deepest level")
+    parser.add_argument('--json', default=None, help="write the results to this file")
+    parser.add_argument('--update', type=int, default=None, metavar='DEPTH',
+                        help="regenerate the reference file to DEPTH instead of checking it")
+    args = parser.parse_args(argv)
+
+    if args.update is not None:
+        write_reference(args.update)
+        print(f"Reference counts to depth {args.update} written to {REFERENCE_PATH}")
+        return
+
+    results = []
+    failed = False
+    print(f"{'Position':<12}{'Depth':>6}{'Nodes':>12}{'Expected':>12}{'Seconds':>10}{'Nodes/s':>12}")
+    for name, reference in load_reference().items():
+        if args.position and name not in args.position:
+            continue
+        engine = GameEngine.from_bytes(bytes.fromhex(reference['snapshot']))
+        counts = reference['counts']
+        for depth in range(1, (args.depth or len(counts)) + 1):
+            start = time.perf_counter()
+            nodes = perft(engine, depth)
+            seconds = time.perf_counter() - start
+            expected = counts[depth - 1] if depth <= len(counts) else None
+            ok = expected is None or nodes == expected
+            failed |= not ok
+            results.append({'position': name, 'depth': depth, 'nodes': nodes, 'expected': expected,
+                            'seconds': seconds, 'nodes_per_second': nodes / seconds if seconds > 0 else 0.0})
+            print(f"{name:<12}{depth:>6}{nodes:>12}{expected if expected is not None else '-':>12}"
+                  f"{seconds:>10.3f}{results[-1]['nodes_per_second']:>12.0f}{'' if ok else '  MISMATCH'}")
+        if args.divide:
+            for label, nodes in divide(engine, depth):
+                print(f"    {label:<48}{nodes:>10}")
+
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump({'perft': results}, json_file, indent=2)
+    if failed:
+        sys.exit("perft counts differ from the stored references")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import os
+import timeit
+from typing import List, Optional
+
+# Render off-screen; must be set before pygame opens a display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from grid_conquer.constants import DEFAULT_LAYOUT
+from grid_conquer.gui.ui import GameUI
+
+def build_ui() -> GameUI:
+    """A GameUI in the standard starting position with a unit selected, so highlights are drawn too."""
+    ui = GameUI()
+    ui.game_engine.place_layout(DEFAULT_LAYOUT)
+    engine = ui.game_engine
+    for position, unit in engine.units.items():
+        if unit.player == engine.current_player and engine.select_unit(position) and engine.valid_moves:
+            break
+    return ui
+
+def milliseconds_per_call(function, number: int) -> float:
+    """Best of five timings of `function`, in milliseconds per call."""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1000
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Time GameUI frames with the SDL dummy video driver")
+    parser.add_argument('--number', type=int, default=200, help="frames per timing run")
+    args = parser.parse_args(argv)
+
+    ui = build_ui()
+    engine = ui.game_engine
+    unit = engine.selected_unit
+
+    def full_frame() -> None:
+        ui.draw_game_state()
+        pygame.display.flip()
+
+    def changed_frame() -> None:
+        # One unit's health changes, so one tile is repainted
+        unit.hp = unit.max_hp - 10 if unit.hp == unit.max_hp else unit.max_hp
+        dirty = ui.draw_changes()
+        pygame.display.update(dirty)
+
+    def idle_frame() -> None:
+        ui.draw_changes()
+
+    print(f"{'Frame':<28}{'ms':>10}")
+    for name, function in (('full redraw + flip', full_frame), ('one changed tile', changed_frame),
+                           ('nothing changed', idle_frame)):
+        print(f"{name:<28}{milliseconds_per_call(function, args.number):>10.3f}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import time
+from typing import List, Optional
+from grid_conquer.batch_engine import attack_first_batch_policy
+from benchmarks.unit_storage import build_position
+from grid_conquer.mcts import MCTSAgent
+
+def rollouts_per_second(agent: MCTSAgent, rollouts: int, seconds: float) -> float:
+    """Rollouts played per second by repeated evaluate_leaf() calls of `rollouts` each."""
+    player = 3 - agent.game_engine.current_player
+    played = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        agent.evaluate_leaf(player, rollouts)
+        played += rollouts
+    return played / (time.perf_counter() - start)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare serial and batched MCTS rollout throughput")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2, 8, 32, 128], help="rollouts per leaf")
+    parser.add_argument('--seconds', type=float, default=1.0, help="timing run per measurement")
+    args = parser.parse_args(argv)
+
+    engine = build_position()
+    serial = MCTSAgent(engine, seed=1)
+    batched = MCTSAgent(engine, batch_rollout_policy=attack_first_batch_policy, seed=1)
+    print(f"{'Rollouts/leaf':<16}{'Serial /s':>12}{'Batched /s':>12}{'Speedup':>10}")
+    for size in args.sizes:
+        serial_rate = rollouts_per_second(serial, size, args.seconds)
+        batched_rate = rollouts_per_second(batched, size, args.seconds)
+        print(f"{size:<16}{serial_rate:>12.0f}{batched_rate:>12.0f}{batched_rate / serial_rate:>10.2f}")
+
+if __name__ == "__main__":
+    main()
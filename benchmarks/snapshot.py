@@ -0,0 +1,44 @@
+import argparse
+import pickle
+from typing import List, Optional
+from benchmarks.unit_storage import build_position, microseconds_per_call
+from grid_conquer.game_engine import GameEngine
+from grid_conquer.symmetry import mirror_snapshot
+
+def check_canonical(engine: GameEngine) -> None:
+    """Fail unless equal positions encode to equal bytes, whatever order their units were added in."""
+    snapshot = engine.to_bytes()
+    for action in engine.legal_actions():
+        engine.apply_action(action)
+        engine.undo_action()
+        if engine.to_bytes() != snapshot:
+            raise AssertionError(f"to_bytes() changed after applying and undoing {action}")
+    if GameEngine.from_bytes(snapshot).to_bytes() != snapshot:
+        raise AssertionError("to_bytes() changed after a from_bytes() round trip")
+    if mirror_snapshot(mirror_snapshot(snapshot)) != snapshot:
+        raise AssertionError("Mirroring a snapshot twice did not restore it")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare GameEngine snapshots against pickle")
+    parser.add_argument('--number', type=int, default=5000, help="calls per timing run")
+    args = parser.parse_args(argv)
+
+    engine = build_position()
+    check_canonical(engine)
+    snapshot = engine.to_bytes()
+    pickled = pickle.dumps(engine, pickle.HIGHEST_PROTOCOL)
+    pickled_units = pickle.dumps(engine.units, pickle.HIGHEST_PROTOCOL)
+
+    print(f"{'Encoding':<22}{'Bytes':>8}{'Encode us':>12}{'Decode us':>12}")
+    for name, size, encode, decode in (
+        ('to_bytes', len(snapshot), engine.to_bytes, lambda: GameEngine.from_bytes(snapshot)),
+        ('pickle engine', len(pickled), lambda: pickle.dumps(engine, pickle.HIGHEST_PROTOCOL),
+         lambda: pickle.loads(pickled)),
+        ('pickle units dict', len(pickled_units), lambda: pickle.dumps(engine.units, pickle.HIGHEST_PROTOCOL),
+         lambda: pickle.loads(pickled_units)),
+    ):
+        print(f"{name:<22}{size:>8}{microseconds_per_call(encode, args.number):>12.2f}"
+              f"{microseconds_per_call(decode, args.number):>12.2f}")
+
+if __name__ == "__main__":
+    main()
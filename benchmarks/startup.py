@@ -0,0 +1,59 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+# Project root, so the benchmark works from any directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules a self-play worker needs, plus the gui package, which must defer its
+# toolkits until a front end is used; none of them may pull in a GUI toolkit
+ENGINE_MODULES = ['grid_conquer', 'grid_conquer.game_engine', 'grid_conquer.search', 'grid_conquer.mcts',
+                  'grid_conquer.agents', 'grid_conquer.tournament', 'grid_conquer.gui']
+GUI_MODULES = ('pygame', 'tkinter', 'PIL')
+
+# Run in a fresh interpreter: imports the modules, then prints the elapsed
+# seconds and any GUI modules that ended up loaded
+PROBE = """
+import sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - start
+gui = sorted(m for m in sys.modules if m.split('.')[0] in {gui!r})
+print(elapsed, ','.join(gui))
+"""
+
+def measure(modules: List[str], runs: int) -> Tuple[List[float], List[float]]:
+    """Import times and whole-process times in seconds, one fresh interpreter per run."""
+    import_times, process_times = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(gui=GUI_MODULES), *modules],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        process_times.append(time.perf_counter() - start)
+        if len(output) > 1:
+            raise RuntimeError(f"Importing {', '.join(modules)} loaded GUI modules: {output[1]}")
+        import_times.append(float(output[0]))
+    return import_times, process_times
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the engine layer")
+    parser.add_argument('modules', nargs='*', default=ENGINE_MODULES, help="modules to import")
+    parser.add_argument('--runs', type=int, default=10, help="fresh interpreters per module")
+    args = parser.parse_args(argv)
+
+    # A bare interpreter is the floor any worker pays before importing anything
+    print(f"{'Module':<26}{'Import ms':>12}{'Process ms':>12}")
+    for name in [None] + args.modules:
+        import_times, process_times = measure([name] if name else [], args.runs)
+        print(f"{name or '(python)':<26}{statistics.median(import_times) * 1000:>12.2f}"
+              f"{statistics.median(process_times) * 1000:>12.2f}")
+
+if __name__ == "__main__":
+    main()
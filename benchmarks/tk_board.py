@@ -0,0 +1,83 @@
+import argparse
+import sys
+import time
+import timeit
+import tkinter as tk
+from typing import List, Optional
+from grid_conquer.constants import DEFAULT_LAYOUT
+from grid_conquer.gui.tkinter_ui import BOARD_RENDERERS, GridConquerUI
+
+def build_ui(board_renderer: str) -> GridConquerUI:
+    """A GridConquerUI in the standard starting position with a unit selected, drawn and mapped."""
+    ui = GridConquerUI(board_renderer)
+    ui.game_engine.place_layout(DEFAULT_LAYOUT)
+    engine = ui.game_engine
+    for position, unit in engine.units.items():
+        if unit.player == engine.current_player and engine.select_unit(position) and engine.valid_moves:
+            break
+    ui.update_display()
+    ui.root.update()
+    return ui
+
+def startup_milliseconds(board_renderer: str, repeat: int) -> float:
+    """Best time to construct, draw and map the window, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ui = build_ui(board_renderer)
+        best = min(best, time.perf_counter() - start)
+        ui.root.destroy()
+    return best * 1000
+
+def update_milliseconds(board_renderer: str, number: int) -> dict:
+    """Milliseconds per update_board plus the idle redraw it triggers, for a few kinds of change."""
+    ui = build_ui(board_renderer)
+    engine = ui.game_engine
+    selected = engine.selected_unit
+    selected_position = next(position for position, unit in engine.units.items() if unit is selected)
+
+    def redraw() -> None:
+        ui.update_board()
+        ui.root.update_idletasks()
+
+    def toggle_selection() -> None:
+        # Every move and attack highlight appears or disappears
+        if engine.selected_unit:
+            engine.selected_unit = None
+            engine.valid_moves, engine.valid_attacks, engine.valid_heals = [], [], []
+        else:
+            engine.select_unit(selected_position)
+        redraw()
+
+    def change_hp() -> None:
+        # One unit's health changes, so one cell is redrawn
+        selected.hp = selected.max_hp - 10 if selected.hp == selected.max_hp else selected.max_hp
+        redraw()
+
+    timings = {}
+    for name, function in (('selection toggled', toggle_selection), ('one HP change', change_hp),
+                           ('nothing changed', redraw)):
+        timings[name] = min(timeit.repeat(function, number=number, repeat=5)) / number * 1000
+    ui.root.destroy()
+    return timings
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare the widget-grid and single-canvas tkinter boards")
+    parser.add_argument('--number', type=int, default=100, help="updates per timing run")
+    parser.add_argument('--repeat', type=int, default=5, help="window constructions per renderer")
+    args = parser.parse_args(argv)
+
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        sys.exit(f"tkinter needs a display to benchmark the board ({e}); try running under xvfb-run")
+
+    results = {renderer: (startup_milliseconds(renderer, args.repeat), update_milliseconds(renderer, args.number))
+               for renderer in BOARD_RENDERERS}
+    print(f"{'Board':<22}" + "".join(f"{renderer:>12}" for renderer in BOARD_RENDERERS) + "  (ms)")
+    print(f"{'startup':<22}" + "".join(f"{results[renderer][0]:>12.2f}" for renderer in BOARD_RENDERERS))
+    for name in results[BOARD_RENDERERS[0]][1]:
+        print(f"{name:<22}" + "".join(f"{results[renderer][1][name]:>12.3f}" for renderer in BOARD_RENDERERS))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import copy
+import timeit
+import tracemalloc
+from typing import List, Optional
+from grid_conquer.constants import DEFAULT_LAYOUT
+from grid_conquer.game_engine import GameEngine
+from grid_conquer.units import Unit
+
+def build_position() -> GameEngine:
+    """A game engine holding the standard ten-unit starting position."""
+    engine = GameEngine()
+    engine.place_layout(DEFAULT_LAYOUT)
+    return engine
+
+def bytes_per_item(factory, count: int) -> float:
+    """Average traced allocation of `count` objects built by `factory`."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+def microseconds_per_call(function, number: int) -> float:
+    """Best of five timings of `function`, in microseconds per call."""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure memory and copy cost of units and positions")
+    parser.add_argument('--count', type=int, default=2000, help="objects allocated for the memory figures")
+    parser.add_argument('--number', type=int, default=2000, help="calls per timing run")
+    args = parser.parse_args(argv)
+
+    unit_type, position, player = DEFAULT_LAYOUT[0]
+    engine = build_position()
+    unit = engine.units[position]
+    units = engine.units
+
+    print(f"{'Measurement':<34}{'Value':>12}")
+    print(f"{'bytes per unit':<34}{bytes_per_item(lambda: Unit(unit_type, player, position), args.count):>12.0f}")
+    print(f"{'bytes per position':<34}{bytes_per_item(build_position, args.count):>12.0f}")
+    print(f"{'copy.copy(unit) us':<34}{microseconds_per_call(lambda: copy.copy(unit), args.number):>12.2f}")
+    print(f"{'copy units dict us':<34}"
+          f"{microseconds_per_call(lambda: {p: copy.copy(u) for p, u in units.items()}, args.number):>12.2f}")
+    print(f"{'copy.deepcopy(position) us':<34}{microseconds_per_call(lambda: copy.deepcopy(engine), args.number // 10):>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Grid Conquer: the game engine, AI agents and self-play tools.
+
+Nothing in this package imports pygame, tkinter or PIL, so self-play workers
+and scripts can use it headless. The front ends live in grid_conquer.gui.
+"""
+from .constants import GameState, UnitType
+from .game_engine import GameEngine
+
+__all__ = ['GameEngine', 'GameState', 'UnitType']
@@ -0,0 +1,41 @@
+from typing import Tuple
+from .constants import BOARD_SIZE, ALL_DIRECTIONS
+
+# Fixed discrete action space: origin square x direction x action kind.
+# Every unit acts on an adjacent square (all ranges are 1), so a direction
+# index from ALL_DIRECTIONS identifies the target square.
+ACTION_KINDS = ('move', 'attack', 'heal')
+NUM_SQUARES = BOARD_SIZE * BOARD_SIZE
+NUM_DIRECTIONS = len(ALL_DIRECTIONS)
+NUM_KINDS = len(ACTION_KINDS)
+NUM_ACTIONS = NUM_SQUARES * NUM_DIRECTIONS * NUM_KINDS
+
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(ALL_DIRECTIONS)}
+KIND_INDEX = {kind: index for index, kind in enumerate(ACTION_KINDS)}
+
+def encode_action(origin: Tuple[int, int], action_type: str, target: Tuple[int, int]) -> int:
+    """Map an (origin, action type, target) triple to its action index."""
+    x, y = origin
+    direction = DIRECTION_INDEX[(target[0] - x, target[1] - y)]
+    return ((y * BOARD_SIZE + x) * NUM_DIRECTIONS + direction) * NUM_KINDS + KIND_INDEX[action_type]
+
+def decode_action(index: int) -> Tuple[Tuple[int, int], str, Tuple[int, int]]:
+    """Map an action index back to (origin, action type, target); the target may be off the board."""
+    rest, kind = divmod(index, NUM_KINDS)
+    square, direction = divmod(rest, NUM_DIRECTIONS)
+    x, y = square % BOARD_SIZE, square // BOARD_SIZE
+    dx, dy = ALL_DIRECTIONS[direction]
+    return (x, y), ACTION_KINDS[kind], (x + dx, y + dy)
+
+def _mirror_index(index: int) -> int:
+    """Index of the same action with the board reflected left to right."""
+    rest, kind = divmod(index, NUM_KINDS)
+    square, direction = divmod(rest, NUM_DIRECTIONS)
+    x, y = square % BOARD_SIZE, square // BOARD_SIZE
+    dx, dy = ALL_DIRECTIONS[direction]
+    mirrored_square = y * BOARD_SIZE + BOARD_SIZE - 1 - x
+    return (mirrored_square * NUM_DIRECTIONS + DIRECTION_INDEX[(-dx, dy)]) * NUM_KINDS + kind
+
+# MIRROR_ACTION[index] is the left-right reflection of an action; it is its own inverse,
+# so it also permutes a legal-action mask (mask[MIRROR_ACTION]) into the mirrored frame
+MIRROR_ACTION = [_mirror_index(index) for index in range(NUM_ACTIONS)]
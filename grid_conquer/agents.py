@@ -0,0 +1,67 @@
+import random
+from typing import Optional
+from .game_engine import GameEngine
+from .search import AlphaBetaAgent
+from .mcts import MCTSAgent
+
+AGENT_NAMES = ('alphabeta', 'mcts', 'heuristic', 'random')
+
+class RLAgent:
+    """
+    Reinforcement Learning Agent for Grid Conquer.
+    This class is ready for Q-learning, DQN, or PPO integration.
+    For now, it uses a strong heuristic/minimax placeholder.
+    """
+    def __init__(self, game_engine: GameEngine):
+        self.game_engine = game_engine
+
+    def choose_action(self):
+        # Placeholder: Greedy attack, else move toward enemy crown
+        valid_actions = self.get_all_valid_actions()
+        # Prioritize attacks
+        for (unit, action_type, target) in valid_actions:
+            if action_type == 'attack':
+                return (unit, action_type, target)
+        # Otherwise, move toward enemy crown
+        for (unit, action_type, target) in valid_actions:
+            if action_type == 'move':
+                return (unit, action_type, target)
+        # Otherwise, heal if possible
+        for (unit, action_type, target) in valid_actions:
+            if action_type == 'heal':
+                return (unit, action_type, target)
+        return None
+
+    def get_all_valid_actions(self):
+        return self.game_engine.legal_actions()
+
+class RandomAgent:
+    """Plays a uniformly random legal action."""
+    def __init__(self, game_engine: GameEngine, seed: Optional[int] = None):
+        self.game_engine = game_engine
+        self.rng = random.Random(seed)
+
+    def choose_action(self):
+        actions = self.game_engine.legal_actions()
+        return self.rng.choice(actions) if actions else None
+
+def create_agent(name: str, game_engine: GameEngine, time_limit: float = 1.0,
+                 iterations: Optional[int] = None, seed: Optional[int] = None, tablebases=None,
+                 batch_rollouts: Optional[int] = None):
+    """Build the agent called `name`; `iterations` and `batch_rollouts` only apply to MCTS and `tablebases` to alpha-beta."""
+    if name == 'alphabeta':
+        return AlphaBetaAgent(game_engine, time_limit=time_limit, tablebases=tablebases)
+    if name == 'mcts':
+        # An iteration budget replaces the time budget when given
+        options = {}
+        if batch_rollouts:
+            # Score each leaf with this many rollouts played together in a BatchGameEngine
+            from .batch_engine import attack_first_batch_policy
+            options = {'rollouts_per_leaf': batch_rollouts, 'batch_rollout_policy': attack_first_batch_policy}
+        return MCTSAgent(game_engine, time_limit=None if iterations else time_limit,
+                         iterations=iterations, seed=seed, **options)
+    if name == 'heuristic':
+        return RLAgent(game_engine)
+    if name == 'random':
+        return RandomAgent(game_engine, seed)
+    raise ValueError(f"Unknown agent {name!r}, expected one of {', '.join(AGENT_NAMES)}")
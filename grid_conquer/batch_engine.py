@@ -0,0 +1,316 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+import numpy as np
+from .constants import (
+    BOARD_SIZE, UnitType, UNIT_STATS, DEFAULT_LAYOUT, HEALER_HEAL_COST,
+    ALL_DIRECTIONS, MOVE_DIRECTIONS, ATTACK_DIRECTIONS, HEAL_DIRECTIONS
+)
+from .action_space import ACTION_KINDS, NUM_SQUARES, NUM_DIRECTIONS, NUM_KINDS, NUM_ACTIONS
+from .search import UNIT_VALUES, HP_WEIGHT, CROWN_HP_WEIGHT, DISTANCE_PENALTY
+
+EMPTY = 0
+NUM_TYPES = len(UnitType) + 1  # index 0 is an empty square
+
+# Per-type lookup tables indexed by UnitType.value (0 = empty)
+MAX_HP = np.zeros(NUM_TYPES, dtype=np.int16)
+ATTACK_DAMAGE = np.zeros(NUM_TYPES, dtype=np.int16)
+CAN_MOVE = np.zeros((NUM_TYPES, NUM_DIRECTIONS), dtype=bool)
+CAN_ATTACK = np.zeros((NUM_TYPES, NUM_DIRECTIONS), dtype=bool)
+CAN_HEAL = np.zeros((NUM_TYPES, NUM_DIRECTIONS), dtype=bool)
+IS_ATTACKER = np.zeros(NUM_TYPES, dtype=bool)
+for _unit_type in UnitType:
+    MAX_HP[_unit_type.value] = UNIT_STATS[_unit_type]['hp']
+    ATTACK_DAMAGE[_unit_type.value] = UNIT_STATS[_unit_type]['attack']
+    IS_ATTACKER[_unit_type.value] = bool(ATTACK_DIRECTIONS[_unit_type])
+    for _index, _direction in enumerate(ALL_DIRECTIONS):
+        CAN_MOVE[_unit_type.value, _index] = _direction in MOVE_DIRECTIONS[_unit_type]
+        CAN_ATTACK[_unit_type.value, _index] = _direction in ATTACK_DIRECTIONS[_unit_type]
+        CAN_HEAL[_unit_type.value, _index] = _direction in HEAL_DIRECTIONS[_unit_type]
+
+# NEIGHBOUR[square, direction] = adjacent square index, or -1 off the board
+NEIGHBOUR = np.full((NUM_SQUARES, NUM_DIRECTIONS), -1, dtype=np.int64)
+for _square in range(NUM_SQUARES):
+    _x, _y = _square % BOARD_SIZE, _square // BOARD_SIZE
+    for _index, (_dx, _dy) in enumerate(ALL_DIRECTIONS):
+        if 0 <= _x + _dx < BOARD_SIZE and 0 <= _y + _dy < BOARD_SIZE:
+            NEIGHBOUR[_square, _index] = (_y + _dy) * BOARD_SIZE + _x + _dx
+
+# Square coordinates, and search.evaluate()'s material value per type, for BatchGameEngine.evaluate
+SQUARE_X = np.arange(NUM_SQUARES) % BOARD_SIZE
+SQUARE_Y = np.arange(NUM_SQUARES) // BOARD_SIZE
+UNIT_VALUE = np.zeros(NUM_TYPES, dtype=np.int64)
+for _unit_type, _value in UNIT_VALUES.items():
+    UNIT_VALUE[_unit_type.value] = _value
+
+# Batched rollout policies take an (N, NUM_ACTIONS) legal mask and a NumPy generator
+# and return one action index per game; every game must have a legal action
+BatchRolloutPolicy = Callable[[np.ndarray, np.random.Generator], np.ndarray]
+
+def random_batch_policy(mask: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Play a uniformly random legal action in every game."""
+    scores = rng.random(mask.shape)
+    scores[~mask] = -1.0
+    return scores.argmax(axis=1)
+
+def attack_first_batch_policy(mask: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Play a random attack in every game that has one, otherwise a random legal action."""
+    scores = rng.random(mask.shape)
+    scores[:, ACTION_KINDS.index('attack')::NUM_KINDS] += 1.0
+    scores[~mask] = -1.0
+    return scores.argmax(axis=1)
+
+class BatchGameEngine:
+    """
+    N independent games stepped in lockstep with NumPy.
+    Each game is stored as unit type, owner and HP planes (viewable as N x 8 x 8)
+    and step() applies one action index per game from the action_space encoding,
+    following the same rules as GameEngine.apply_action. Finished games are
+    reset to the starting layout automatically.
+    """
+    def __init__(self, num_games: int, layout: Sequence[Tuple[UnitType, Tuple[int, int], int]] = DEFAULT_LAYOUT,
+                 max_plies: Optional[int] = 200):
+        self.num_games = num_games
+        self.max_plies = max_plies  # games longer than this are reset as draws
+
+        # Starting position every game is reset to
+        self.start_types = np.zeros(NUM_SQUARES, dtype=np.int8)
+        self.start_owners = np.zeros(NUM_SQUARES, dtype=np.int8)
+        self.start_hp = np.zeros(NUM_SQUARES, dtype=np.int16)
+        for unit_type, (x, y), player in layout:
+            square = y * BOARD_SIZE + x
+            self.start_types[square] = unit_type.value
+            self.start_owners[square] = player
+            self.start_hp[square] = UNIT_STATS[unit_type]['hp']
+
+        # Board planes, flattened to (N, 64) for indexing by square
+        self.types = np.empty((num_games, NUM_SQUARES), dtype=np.int8)
+        self.owners = np.empty((num_games, NUM_SQUARES), dtype=np.int8)
+        self.hp = np.empty((num_games, NUM_SQUARES), dtype=np.int16)
+        self.current_player = np.empty(num_games, dtype=np.int8)
+        self.plies = np.empty(num_games, dtype=np.int32)
+        # crowns[g, p] / attackers[g, p]: living crowns and soldiers+knights of player p
+        self.crowns = np.empty((num_games, 3), dtype=np.int8)
+        self.attackers = np.empty((num_games, 3), dtype=np.int8)
+        self._games = np.arange(num_games)
+        self.reset()
+
+    @property
+    def type_planes(self) -> np.ndarray:
+        """Unit type per square (UnitType.value, 0 = empty) as an N x 8 x 8 view."""
+        return self.types.reshape(self.num_games, BOARD_SIZE, BOARD_SIZE)
+
+    @property
+    def owner_planes(self) -> np.ndarray:
+        """Owning player per square (0 = empty) as an N x 8 x 8 view."""
+        return self.owners.reshape(self.num_games, BOARD_SIZE, BOARD_SIZE)
+
+    @property
+    def hp_planes(self) -> np.ndarray:
+        """HP per square as an N x 8 x 8 view."""
+        return self.hp.reshape(self.num_games, BOARD_SIZE, BOARD_SIZE)
+
+    def reset(self, games: Optional[np.ndarray] = None) -> None:
+        """Reset all games, or only the games selected by an index or boolean array."""
+        if games is None:
+            games = slice(None)
+        # Start planes are either shared (64,) or per game (N, 64) after load_layouts()
+        per_game = self.start_types.ndim == 2
+        start_types = self.start_types[games] if per_game else self.start_types
+        start_owners = self.start_owners[games] if per_game else self.start_owners
+        self.types[games] = start_types
+        self.owners[games] = start_owners
+        self.hp[games] = self.start_hp[games] if per_game else self.start_hp
+        self.current_player[games] = 1
+        self.plies[games] = 0
+        for player in (1, 2):
+            own = start_owners == player
+            self.crowns[games, player] = np.count_nonzero(own & (start_types == UnitType.CROWN.value), axis=-1)
+            self.attackers[games, player] = np.count_nonzero(own & IS_ATTACKER[start_types], axis=-1)
+
+    @classmethod
+    def from_units(cls, units: List, num_games: int, current_player: int = 1) -> 'BatchGameEngine':
+        """`num_games` copies of one position (e.g. GameEngine.get_all_units()) to play out independently."""
+        engine = cls(num_games, max_plies=None)
+        engine.load_units(0, units, current_player)
+        for name in ('types', 'owners', 'hp', 'current_player', 'plies', 'crowns', 'attackers'):
+            planes = getattr(engine, name)
+            planes[1:] = planes[0]
+        return engine
+
+    def load_layouts(self, types: np.ndarray, owners: np.ndarray, hp: np.ndarray) -> None:
+        """Give every game its own starting position as (N, 64) type, owner and HP planes, then reset."""
+        self.start_types = np.asarray(types, dtype=np.int8).reshape(self.num_games, NUM_SQUARES)
+        self.start_owners = np.asarray(owners, dtype=np.int8).reshape(self.num_games, NUM_SQUARES)
+        self.start_hp = np.asarray(hp, dtype=np.int16).reshape(self.num_games, NUM_SQUARES)
+        self.reset()
+
+    def subset(self, games: np.ndarray) -> 'BatchGameEngine':
+        """A new engine holding copies of the selected games, mid-game state included."""
+        engine = BatchGameEngine(len(games), max_plies=self.max_plies)
+        if self.start_types.ndim == 2:
+            engine.start_types = self.start_types[games]
+            engine.start_owners = self.start_owners[games]
+            engine.start_hp = self.start_hp[games]
+        else:
+            engine.start_types = self.start_types.copy()
+            engine.start_owners = self.start_owners.copy()
+            engine.start_hp = self.start_hp.copy()
+        for name in ('types', 'owners', 'hp', 'current_player', 'plies', 'crowns', 'attackers'):
+            setattr(engine, name, getattr(self, name)[games])
+        return engine
+
+    def legal_mask(self) -> np.ndarray:
+        """Boolean (N, NUM_ACTIONS) mask of the legal actions in every game."""
+        n = self.num_games
+        player = self.current_player[:, None, None]
+        types = self.types.reshape(n, BOARD_SIZE, BOARD_SIZE)
+        own = self.owners.reshape(n, BOARD_SIZE, BOARD_SIZE) == player
+
+        # Pad the planes by one square so each direction's targets are a plain slice;
+        # the border is neither empty nor owned by anyone
+        padded_types = np.full((n, BOARD_SIZE + 2, BOARD_SIZE + 2), -1, dtype=np.int8)
+        padded_owners = np.zeros((n, BOARD_SIZE + 2, BOARD_SIZE + 2), dtype=np.int8)
+        padded_hp = np.zeros((n, BOARD_SIZE + 2, BOARD_SIZE + 2), dtype=np.int16)
+        padded_types[:, 1:-1, 1:-1] = types
+        padded_owners[:, 1:-1, 1:-1] = self.owners.reshape(n, BOARD_SIZE, BOARD_SIZE)
+        padded_hp[:, 1:-1, 1:-1] = self.hp.reshape(n, BOARD_SIZE, BOARD_SIZE)
+        padded_max_hp = MAX_HP[np.maximum(padded_types, 0)]
+
+        can_move = CAN_MOVE[types]
+        can_attack = CAN_ATTACK[types]
+        can_heal = CAN_HEAL[types]
+        mask = np.zeros((n, BOARD_SIZE, BOARD_SIZE, NUM_DIRECTIONS, NUM_KINDS), dtype=bool)
+        for direction, (dx, dy) in enumerate(ALL_DIRECTIONS):
+            rows = slice(1 + dy, 1 + dy + BOARD_SIZE)
+            columns = slice(1 + dx, 1 + dx + BOARD_SIZE)
+            target_types = padded_types[:, rows, columns]
+            target_owners = padded_owners[:, rows, columns]
+            mask[..., direction, 0] = own & can_move[..., direction] & (target_types == EMPTY)
+            mask[..., direction, 1] = own & can_attack[..., direction] & (target_owners == 3 - player)
+            mask[..., direction, 2] = (own & can_heal[..., direction] & (target_owners == player)
+                                       & (padded_hp[:, rows, columns] < padded_max_hp[:, rows, columns]))
+        return mask.reshape(n, NUM_ACTIONS)
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Apply one action per game and switch turns.
+
+        Returns (rewards, dones, winners, valid): rewards are +1/-1 for the player who
+        just moved when the game ends, winners are 1 or 2 (0 for a draw by the ply
+        limit), and valid flags actions that were legal. An illegal action is treated
+        as a pass. Games that ended are reset before returning.
+        """
+        games = self._games
+        actions = np.asarray(actions, dtype=np.int64)
+        rest, kind = np.divmod(actions, NUM_KINDS)
+        origin, direction = np.divmod(rest, NUM_DIRECTIONS)
+        target = NEIGHBOUR[origin, direction]
+        on_board = target >= 0
+        target = np.where(on_board, target, 0)
+
+        player = self.current_player.copy()
+        unit_type = self.types[games, origin]
+        unit_hp = self.hp[games, origin]
+        target_type = self.types[games, target]
+        target_owner = self.owners[games, target]
+        target_hp = self.hp[games, target]
+        mine = on_board & (self.owners[games, origin] == player)
+
+        moves = mine & (kind == 0) & CAN_MOVE[unit_type, direction] & (target_type == EMPTY)
+        attacks = mine & (kind == 1) & CAN_ATTACK[unit_type, direction] & (target_owner == 3 - player)
+        heals = (mine & (kind == 2) & CAN_HEAL[unit_type, direction] & (target_owner == player)
+                 & (target_hp < MAX_HP[target_type]))
+
+        # Moves: copy the unit to the target square and clear the origin
+        g = games[moves]
+        self.types[g, target[moves]] = unit_type[moves]
+        self.owners[g, target[moves]] = player[moves]
+        self.hp[g, target[moves]] = unit_hp[moves]
+        self._clear(g, origin[moves])
+
+        # Attacks: damage the target and remove it if it dies
+        g = games[attacks]
+        new_hp = np.maximum(target_hp[attacks] - ATTACK_DAMAGE[unit_type[attacks]], 0)
+        self.hp[g, target[attacks]] = new_hp
+        killed = new_hp == 0
+        if killed.any():
+            dead_games = g[killed]
+            dead_types = target_type[attacks][killed]
+            dead_owners = target_owner[attacks][killed]
+            np.subtract.at(self.crowns, (dead_games, dead_owners),
+                           (dead_types == UnitType.CROWN.value).astype(np.int8))
+            np.subtract.at(self.attackers, (dead_games, dead_owners), IS_ATTACKER[dead_types].astype(np.int8))
+            self._clear(dead_games, target[attacks][killed])
+
+        # Heals: the healer pays what it heals (capped at its own HP) and may die doing so
+        g = games[heals]
+        amount = np.minimum(HEALER_HEAL_COST, unit_hp[heals])
+        healed_type = target_type[heals]
+        healed_hp = np.where(healed_type == UnitType.HEALER.value,
+                             np.maximum(target_hp[heals] - amount, 0),  # healers lose HP when "healed"
+                             np.minimum(target_hp[heals] + amount, MAX_HP[healed_type]))
+        self.hp[g, target[heals]] = healed_hp
+        healer_hp = unit_hp[heals] - amount
+        self.hp[g, origin[heals]] = healer_hp
+        self._clear(g[healer_hp == 0], origin[heals][healer_hp == 0])
+
+        # Switch turns, then apply check_game_over's rules in the same order
+        self.current_player[:] = 3 - player
+        self.plies += 1
+        winners = np.zeros(self.num_games, dtype=np.int8)
+        winners[self.attackers[:, 2] == 0] = 1
+        winners[self.attackers[:, 1] == 0] = 2
+        winners[self.crowns[:, 2] == 0] = 1
+        winners[self.crowns[:, 1] == 0] = 2
+        dones = winners > 0
+        if self.max_plies is not None:
+            dones |= self.plies >= self.max_plies
+
+        rewards = np.zeros(self.num_games, dtype=np.float32)
+        rewards[winners == player] = 1.0
+        rewards[(winners > 0) & (winners != player)] = -1.0
+        if dones.any():
+            self.reset(dones)
+        return rewards, dones, winners, moves | attacks | heals
+
+    def evaluate(self, player: int) -> np.ndarray:
+        """search.evaluate() of every game from `player`'s point of view."""
+        types = self.types
+        hp = self.hp.astype(np.int64)
+        crowns = types == UnitType.CROWN.value
+        value = np.where(crowns, CROWN_HP_WEIGHT * hp, UNIT_VALUE[types] + HP_WEIGHT * hp)
+        value[types == EMPTY] = 0
+        # Attackers lose DISTANCE_PENALTY per step to the enemy crown, walking as they move
+        attackers = IS_ATTACKER[types]
+        soldiers = types == UnitType.SOLDIER.value
+        for owner in (1, 2):
+            enemy_crown = crowns & (self.owners == 3 - owner)
+            square = enemy_crown.argmax(axis=1)
+            dx = np.abs(SQUARE_X - SQUARE_X[square][:, None])
+            dy = np.abs(SQUARE_Y - SQUARE_Y[square][:, None])
+            distance = np.where(soldiers, dx + dy, np.maximum(dx, dy))
+            penalised = attackers & (self.owners == owner) & enemy_crown.any(axis=1)[:, None]
+            value -= np.where(penalised, DISTANCE_PENALTY * distance, 0)
+        return np.where(self.owners == player, value, -value).sum(axis=1)
+
+    def _clear(self, games: np.ndarray, squares: np.ndarray) -> None:
+        """Empty the given squares."""
+        self.types[games, squares] = EMPTY
+        self.owners[games, squares] = 0
+        self.hp[games, squares] = 0
+
+    def load_units(self, game: int, units: List, current_player: int = 1) -> None:
+        """Copy a list of Unit objects (e.g. GameEngine.get_all_units()) into one game slot."""
+        self.types[game] = EMPTY
+        self.owners[game] = 0
+        self.hp[game] = 0
+        for unit in units:
+            x, y = unit.position
+            square = y * BOARD_SIZE + x
+            self.types[game, square] = unit.unit_type.value
+            self.owners[game, square] = unit.player
+            self.hp[game, square] = unit.hp
+        self.current_player[game] = current_player
+        self.plies[game] = 0
+        for player in (1, 2):
+            own = self.owners[game] == player
+            self.crowns[game, player] = np.count_nonzero(own & (self.types[game] == UnitType.CROWN.value))
+            self.attackers[game, player] = np.count_nonzero(own & IS_ATTACKER[self.types[game]])
@@ -0,0 +1,152 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+from .constants import BOARD_SIZE, UnitType
+from .units import RayTable, MOVE_TABLE, ATTACK_TABLE, HEAL_TABLE
+
+# Square index = y * BOARD_SIZE + x, so bit 0 is the top-left tile
+FULL_MASK = (1 << (BOARD_SIZE * BOARD_SIZE)) - 1
+
+def square_position(index: int) -> Tuple[int, int]:
+    """Convert a bit index back to an (x, y) position."""
+    return (index % BOARD_SIZE, index // BOARD_SIZE)
+
+def position_bit(position: Tuple[int, int]) -> int:
+    """Get the single-bit mask for a position."""
+    x, y = position
+    return 1 << (y * BOARD_SIZE + x)
+
+def popcount(mask: int) -> int:
+    """Count the squares set in a mask."""
+    return bin(mask).count('1')
+
+# (x, y) position of every square index
+SQUARE_POSITIONS = [square_position(index) for index in range(BOARD_SIZE * BOARD_SIZE)]
+
+def mask_positions(mask: int) -> List[Tuple[int, int]]:
+    """Get the (x, y) positions of every square set in a mask, lowest first."""
+    positions = []
+    while mask:
+        low = mask & -mask
+        positions.append(SQUARE_POSITIONS[low.bit_length() - 1])
+        mask ^= low
+    return positions
+
+# Per unit type and square: (mask of the first square of every ray, the rays longer than
+# one square as tuples of bits). Built once from the unit ray tables, so a unit's targets
+# are one AND with the board masks plus a walk of its long rays, if it has any
+NeighbourTable = Dict[UnitType, Dict[Tuple[int, int], Tuple[int, Tuple[Tuple[int, ...], ...]]]]
+
+def _neighbour_masks(ray_table: RayTable) -> NeighbourTable:
+    """Turn a ray table into first-square masks plus the bits of the longer rays."""
+    table = {}
+    for unit_type, squares in ray_table.items():
+        table[unit_type] = {}
+        for position, rays in squares.items():
+            first = 0
+            for ray in rays:
+                first |= position_bit(ray[0])
+            long_rays = tuple(tuple(position_bit(square) for square in ray) for ray in rays if len(ray) > 1)
+            table[unit_type][position] = (first, long_rays)
+    return table
+
+MOVE_MASKS = _neighbour_masks(MOVE_TABLE)
+ATTACK_MASKS = _neighbour_masks(ATTACK_TABLE)
+HEAL_MASKS = _neighbour_masks(HEAL_TABLE)
+
+class Bitboards:
+    """Board occupancy kept as one bitmask per player and one per unit type."""
+
+    def __init__(self):
+        self.players: Dict[int, int] = {1: 0, 2: 0}
+        self.types: Dict[UnitType, int] = {unit_type: 0 for unit_type in UnitType}
+
+    @classmethod
+    def from_units(cls, units: Iterable) -> 'Bitboards':
+        """Build the masks from a collection of units."""
+        bitboards = cls()
+        for unit in units:
+            if unit.alive:
+                bitboards.add(unit.unit_type, unit.player, unit.position)
+        return bitboards
+
+    @property
+    def occupied(self) -> int:
+        """Mask of every occupied square."""
+        return self.players[1] | self.players[2]
+
+    def add(self, unit_type: UnitType, player: int, position: Tuple[int, int]) -> None:
+        """Mark a unit as standing on a square."""
+        bit = position_bit(position)
+        self.players[player] |= bit
+        self.types[unit_type] |= bit
+
+    def remove(self, unit_type: UnitType, player: int, position: Tuple[int, int]) -> None:
+        """Clear a unit from a square."""
+        bit = ~position_bit(position)
+        self.players[player] &= bit
+        self.types[unit_type] &= bit
+
+    def move(self, unit_type: UnitType, player: int, old_position: Tuple[int, int], new_position: Tuple[int, int]) -> None:
+        """Move a unit between two squares."""
+        change = position_bit(old_position) | position_bit(new_position)
+        self.players[player] ^= change
+        self.types[unit_type] ^= change
+
+    def move_mask(self, unit_type: UnitType, position: Tuple[int, int]) -> int:
+        """Mask of the squares a unit on `position` can move to."""
+        empty = FULL_MASK & ~(self.players[1] | self.players[2])
+        first, long_rays = MOVE_MASKS[unit_type][position]
+        targets = first & empty
+        for ray in long_rays:
+            # Stop at the first occupied square
+            for bit in ray:
+                if not bit & empty:
+                    break
+                targets |= bit
+        return targets
+
+    def attack_mask(self, unit_type: UnitType, player: int, position: Tuple[int, int]) -> int:
+        """Mask of the enemy squares a unit on `position` can attack."""
+        enemies = self.players[3 - player]
+        first, long_rays = ATTACK_MASKS[unit_type][position]
+        targets = first & enemies
+        for ray in long_rays:
+            # Hit the first enemy along the ray
+            for bit in ray:
+                if bit & enemies:
+                    targets |= bit
+                    break
+        return targets
+
+    def heal_mask(self, unit_type: UnitType, player: int, position: Tuple[int, int]) -> int:
+        """Mask of the friendly squares a unit on `position` can heal."""
+        return HEAL_MASKS[unit_type][position][0] & self.players[player]
+
+    def iter_actions(self, player: int) -> Iterator[Tuple[Tuple[int, int], str, Tuple[int, int]]]:
+        """Yield every (origin, action type, target) available to a player.
+
+        Each unit's targets come from its precomputed neighbour masks, one AND with
+        the empty, enemy or friendly squares, so no ray is walked for units that
+        only reach one square along each direction.
+        """
+        players = self.players
+        own = players[player]
+        enemies = players[3 - player]
+        empty = FULL_MASK & ~(own | enemies)
+        for unit_type in UnitType:
+            origins = own & self.types[unit_type]
+            if not origins:
+                continue
+            move_masks = MOVE_MASKS[unit_type]
+            attack_masks = ATTACK_MASKS[unit_type]
+            heal_masks = HEAL_MASKS[unit_type]
+            for origin in mask_positions(origins):
+                first, long_rays = move_masks[origin]
+                targets = self.move_mask(unit_type, origin) if long_rays else first & empty
+                for target in mask_positions(targets):
+                    yield (origin, 'move', target)
+                first, long_rays = attack_masks[origin]
+                targets = self.attack_mask(unit_type, player, origin) if long_rays else first & enemies
+                for target in mask_positions(targets):
+                    yield (origin, 'attack', target)
+                for target in mask_positions(heal_masks[origin][0] & own):
+                    yield (origin, 'heal', target)
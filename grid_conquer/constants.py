@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 # Game board dimensions
 BOARD_SIZE = 8
@@ -21,8 +21,8 @@ class GameState(Enum):
     PLAYER_2_TURN = 3
     GAME_OVER = 4
 
-# Unit types
-class UnitType(Enum):
+# Unit types; an IntEnum so they hash and compare as small ints
+class UnitType(IntEnum):
     SOLDIER = 1
     KNIGHT = 2
     HEALER = 3
@@ -73,10 +73,52 @@ ORTHOGONAL_DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # Right, Down, Left,
 DIAGONAL_DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]  # Diagonal
 ALL_DIRECTIONS = ORTHOGONAL_DIRECTIONS + DIAGONAL_DIRECTIONS
 
+# Directions each unit type can move, attack and heal along
+MOVE_DIRECTIONS = {
+    UnitType.SOLDIER: ORTHOGONAL_DIRECTIONS,
+    UnitType.KNIGHT: DIAGONAL_DIRECTIONS,
+    UnitType.HEALER: ALL_DIRECTIONS,
+    UnitType.WALL: [],
+    UnitType.CROWN: []
+}
+ATTACK_DIRECTIONS = {
+    UnitType.SOLDIER: ORTHOGONAL_DIRECTIONS,
+    UnitType.KNIGHT: DIAGONAL_DIRECTIONS,
+    UnitType.HEALER: [],
+    UnitType.WALL: [],
+    UnitType.CROWN: []
+}
+HEAL_DIRECTIONS = {
+    UnitType.SOLDIER: [],
+    UnitType.KNIGHT: [],
+    UnitType.HEALER: ALL_DIRECTIONS,
+    UnitType.WALL: [],
+    UnitType.CROWN: []
+}
+
+# Order units are placed in during the placement phase, one per player per round
+PLACEMENT_ORDER = [UnitType.SOLDIER, UnitType.KNIGHT, UnitType.HEALER, UnitType.WALL, UnitType.CROWN]
+
+# Standard starting layout used by headless tools: (unit type, (x, y), player).
+# Player 2's half mirrors player 1's across the middle of the board.
+DEFAULT_LAYOUT = [
+    (UnitType.SOLDIER, (3, 2), 1),
+    (UnitType.KNIGHT, (4, 2), 1),
+    (UnitType.HEALER, (4, 1), 1),
+    (UnitType.WALL, (3, 1), 1),
+    (UnitType.CROWN, (3, 0), 1),
+    (UnitType.SOLDIER, (3, 5), 2),
+    (UnitType.KNIGHT, (4, 5), 2),
+    (UnitType.HEALER, (4, 6), 2),
+    (UnitType.WALL, (3, 6), 2),
+    (UnitType.CROWN, (3, 7), 2)
+]
+
 # Window settings
 WINDOW_WIDTH = BOARD_SIZE * TILE_SIZE
 WINDOW_HEIGHT = BOARD_SIZE * TILE_SIZE
 WINDOW_TITLE = "Grid Conquer"
+MAX_FPS = 30  # redraw cap of the event-driven pygame loop
 
 # Game settings
 HEAL_AMOUNT = 30
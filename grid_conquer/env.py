@@ -0,0 +1,129 @@
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from .constants import BOARD_SIZE, GameState, UnitType, DEFAULT_LAYOUT
+from .game_engine import GameEngine
+from .action_space import NUM_ACTIONS, MIRROR_ACTION, encode_action, decode_action
+from .symmetry import is_canonical
+
+# Observation planes, always from the point of view of the player to move
+NUM_UNIT_TYPES = len(UnitType)
+OWN_UNITS_PLANE = 0                           # one plane per UnitType for the mover's units
+ENEMY_UNITS_PLANE = NUM_UNIT_TYPES            # one plane per UnitType for the opponent's units
+OWN_HP_PLANE = 2 * NUM_UNIT_TYPES             # mover's HP as a fraction of max HP
+ENEMY_HP_PLANE = OWN_HP_PLANE + 1             # opponent's HP as a fraction of max HP
+SIDE_PLANE = ENEMY_HP_PLANE + 1               # all ones when player 2 is to move
+NUM_PLANES = SIDE_PLANE + 1
+
+class GridConquerEnv:
+    """
+    Gym-style environment around GameEngine for self-play training.
+    Both players act through the same step(); rewards are for the player who
+    just acted. The observation and legal-action mask are preallocated arrays
+    refreshed in place, so callers must copy them if they keep old steps.
+    With canonical=True every position is presented in its canonical mirror
+    orientation (see symmetry.py): the observation, the mask and the actions
+    passed to step() are all in that frame, and info['mirrored'] says whether
+    it is the reflection of the real board.
+    """
+    def __init__(self, layout: Sequence[Tuple[UnitType, Tuple[int, int], int]] = DEFAULT_LAYOUT,
+                 max_plies: Optional[int] = 200, canonical: bool = False):
+        self.layout = layout
+        self.max_plies = max_plies
+        self.canonical = canonical
+        self.mirrored = False  # whether the current observation is the mirror image of the board
+        self.num_actions = NUM_ACTIONS
+        self.observation = np.zeros((NUM_PLANES, BOARD_SIZE, BOARD_SIZE), dtype=np.float32)
+        self.action_mask = np.zeros(NUM_ACTIONS, dtype=bool)
+        self.game_engine = GameEngine()
+        self.plies = 0
+
+    def reset(self) -> np.ndarray:
+        """Start a new game from the layout and return the first observation."""
+        self.game_engine = GameEngine()
+        self.game_engine.place_layout(self.layout)
+        self.plies = 0
+        self._refresh()
+        return self.observation
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, dict]:
+        """Play an action index for the player to move.
+
+        Returns (observation, reward, done, info). A side left without legal
+        actions passes automatically; if both sides are stuck, or max_plies is
+        reached, the game ends as a draw with info['truncated'] set.
+        """
+        engine = self.game_engine
+        action = int(action)  # NumPy integers would leak into unit positions
+        if engine.state == GameState.GAME_OVER:
+            raise ValueError("step() called on a finished game; call reset()")
+        if not 0 <= action < NUM_ACTIONS or not self.action_mask[action]:
+            raise ValueError(f"Illegal action {action}")
+
+        if self.mirrored:
+            action = MIRROR_ACTION[action]
+        origin, action_type, target = decode_action(action)
+        player = engine.current_player
+        engine.apply_action((engine.units[origin], action_type, target))
+        self.plies += 1
+
+        truncated = False
+        if engine.state != GameState.GAME_OVER:
+            self._fill_mask()
+            if not self.action_mask.any():
+                engine.end_turn()
+                self._fill_mask()
+                truncated = not self.action_mask.any()
+            if self.max_plies is not None and self.plies >= self.max_plies:
+                truncated = True
+        self._fill_observation()
+
+        done = engine.state == GameState.GAME_OVER or truncated
+        reward = 0.0
+        if engine.state == GameState.GAME_OVER:
+            reward = 1.0 if engine.winner == player else -1.0
+            self.action_mask[:] = False
+        return self.observation, reward, done, {'winner': engine.winner, 'truncated': truncated,
+                                                'mirrored': self.mirrored}
+
+    def legal_action_mask(self) -> np.ndarray:
+        """Mask of the legal action indices for the player to move."""
+        return self.action_mask
+
+    def _refresh(self) -> None:
+        """Recompute the observation and mask for the current position."""
+        self._fill_mask()
+        self._fill_observation()
+
+    def _orient(self) -> None:
+        """Decide whether the current position is presented mirrored."""
+        self.mirrored = self.canonical and not is_canonical(self.game_engine)
+
+    def _fill_mask(self) -> None:
+        """Write the legal actions of the player to move into the preallocated mask."""
+        self._orient()
+        mask = self.action_mask
+        mask[:] = False
+        for unit, action_type, target in self.game_engine.iter_legal_actions():
+            index = encode_action(unit.position, action_type, target)
+            mask[MIRROR_ACTION[index] if self.mirrored else index] = True
+
+    def _fill_observation(self) -> None:
+        """Write the current position into the preallocated observation planes."""
+        self._orient()
+        observation = self.observation
+        observation.fill(0.0)
+        player = self.game_engine.current_player
+        mirrored = self.mirrored
+        for unit in self.game_engine.units.values():
+            x, y = unit.position
+            if mirrored:
+                # Write the reflected board directly, so no flipped copy is allocated
+                x = BOARD_SIZE - 1 - x
+            if unit.player == player:
+                observation[OWN_UNITS_PLANE + unit.unit_type.value - 1, y, x] = 1.0
+                observation[OWN_HP_PLANE, y, x] = unit.hp / unit.max_hp
+            else:
+                observation[ENEMY_UNITS_PLANE + unit.unit_type.value - 1, y, x] = 1.0
+                observation[ENEMY_HP_PLANE, y, x] = unit.hp / unit.max_hp
+        if player == 2:
+            observation[SIDE_PLANE] = 1.0
@@ -0,0 +1,458 @@
+import struct
+from typing import Iterator, List, Tuple, Optional, Dict
+from .constants import GameState, UnitType, BOARD_SIZE, HEAL_AMOUNT, HEALER_HEAL_COST
+from .units import Unit
+from .bitboard import Bitboards, mask_positions, popcount
+from .zobrist import unit_key, mirror_unit_key, side_key
+
+Action = Tuple[Unit, str, Tuple[int, int]]  # (unit, 'move' | 'attack' | 'heal', target)
+MoveKey = Tuple[Tuple[int, int], str, Tuple[int, int]]  # (origin, action type, target)
+
+# Unit types that can attack; a player left without any of these loses
+ATTACKING_TYPES = frozenset((UnitType.SOLDIER, UnitType.KNIGHT))
+
+# Everything needed to take back one applied action:
+# (action type, acting unit, origin, acting unit's HP, target unit, target HP,
+#  removed unit, previous state, previous player, previous winner, previous piece hashes)
+UndoRecord = Tuple[str, Unit, Tuple[int, int], int, Optional[Unit], int,
+                   Optional[Unit], GameState, int, Optional[int], int, int]
+
+# Snapshot format written by to_bytes(): a header, then one record per unit
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<BBBBB')  # version, state, current player, winner (0 = none), unit count
+SNAPSHOT_UNIT = struct.Struct('<BBH')      # unit type << 2 | player, square (y * BOARD_SIZE + x), HP
+_UNIT_TYPES = {unit_type.value: unit_type for unit_type in UnitType}
+_GAME_STATES = {state.value: state for state in GameState}
+
+class GameEngine:
+    def __init__(self, debug_hash: bool = False):
+        self.state = GameState.PLACEMENT_PHASE
+        self.current_player = 1
+        self.units: Dict[Tuple[int, int], Unit] = {}  # position -> Unit
+        self.selected_unit: Optional[Unit] = None
+        self.valid_moves: List[Tuple[int, int]] = []
+        self.valid_attacks: List[Tuple[int, int]] = []
+        self.valid_heals: List[Tuple[int, int]] = []
+        self.bitboards = Bitboards()  # occupancy masks mirroring self.units
+        self.winner: Optional[int] = None
+        # Living crowns and attacking units per player, kept up to date on every add/remove
+        self.crown_counts: Dict[int, int] = {1: 0, 2: 0}
+        self.attacker_counts: Dict[int, int] = {1: 0, 2: 0}
+        self.undo_stack: List[UndoRecord] = []
+        # Zobrist hash of the units on the board (type, owner, square, HP bucket),
+        # updated incrementally; zobrist_hash folds in the side to move
+        self.piece_hash = 0
+        # The same hash for the board reflected left to right (x -> BOARD_SIZE - 1 - x);
+        # the rules are symmetric under that reflection, see symmetry.py
+        self.mirror_piece_hash = 0
+        # When set, every mutation checks the incremental hash against a full recompute
+        self.debug_hash = debug_hash
+
+    def is_valid_placement(self, position: Tuple[int, int], player: int) -> bool:
+        """Check if a position is valid for unit placement."""
+        x, y = position
+        
+        # Check if position is within player's starting area
+        if player == 1 and y >= 3:  # Bottom 3 rows for player 1
+            return False
+        if player == 2 and y < 5:   # Top 3 rows for player 2
+            return False
+            
+        # Check if position is already occupied
+        return position not in self.units
+
+    def place_unit(self, unit_type: UnitType, position: Tuple[int, int], player: int) -> bool:
+        """Place a unit on the board during the placement phase."""
+        if self.state != GameState.PLACEMENT_PHASE:
+            return False
+            
+        if not self.is_valid_placement(position, player):
+            return False
+            
+        unit = Unit(unit_type, player, position)
+        self._add_unit(unit)
+        if self.debug_hash:
+            self.verify_hash()
+        return True
+
+    def place_layout(self, layout) -> bool:
+        """Place a whole (unit type, position, player) layout and start the game."""
+        for unit_type, position, player in layout:
+            if not self.place_unit(unit_type, position, player):
+                return False
+        return self.start_game()
+
+    def start_game(self) -> bool:
+        """Start the game after placement phase."""
+        if self.state != GameState.PLACEMENT_PHASE:
+            return False
+            
+        # Check if both players have placed all their units
+        if popcount(self.bitboards.players[1]) != 5 or popcount(self.bitboards.players[2]) != 5:
+            return False
+            
+        self.state = GameState.PLAYER_1_TURN
+        return True
+
+    def select_unit(self, position: Tuple[int, int]) -> bool:
+        """Select a unit for movement/attack/heal."""
+        if self.state not in [GameState.PLAYER_1_TURN, GameState.PLAYER_2_TURN]:
+            return False
+            
+        if position not in self.units:
+            return False
+            
+        unit = self.units[position]
+        if unit.player != self.current_player or not unit.alive:
+            return False
+            
+        self.selected_unit = unit
+        self.update_valid_actions()
+        return True
+
+    def update_valid_actions(self) -> None:
+        """Update valid moves, attacks, and heals for the selected unit."""
+        if not self.selected_unit:
+            return
+            
+        unit = self.selected_unit
+        if not unit.alive:
+            self.valid_moves, self.valid_attacks, self.valid_heals = [], [], []
+            return
+        # Read the targets off the occupancy bitboards, which only hold live units
+        bitboards = self.bitboards
+        self.valid_moves = mask_positions(bitboards.move_mask(unit.unit_type, unit.position))
+        self.valid_attacks = mask_positions(bitboards.attack_mask(unit.unit_type, unit.player, unit.position))
+        self.valid_heals = mask_positions(bitboards.heal_mask(unit.unit_type, unit.player, unit.position))
+
+    def iter_legal_actions(self, player: Optional[int] = None) -> Iterator[Action]:
+        """Lazily yield every (unit, action type, target) available to a player.
+
+        All actions come from one snapshot of the occupancy bitboards and the
+        selection state is left untouched. Heals on units already at full HP are
+        skipped because heal_unit would reject them.
+        """
+        if player is None:
+            player = self.current_player
+        units = self.units
+        for origin, action_type, target in self.bitboards.iter_actions(player):
+            if action_type == 'heal':
+                target_unit = units[target]
+                if target_unit.hp >= target_unit.max_hp:
+                    continue
+            yield (units[origin], action_type, target)
+
+    def legal_actions(self, player: Optional[int] = None) -> List[Action]:
+        """Get every (unit, action type, target) available to a player."""
+        return list(self.iter_legal_actions(player))
+
+    def move_unit(self, new_position: Tuple[int, int]) -> bool:
+        """Move the selected unit to a new position."""
+        if not self.selected_unit or new_position not in self.valid_moves:
+            return False
+            
+        # Remove unit from old position and add to new position
+        self._relocate_unit(self.selected_unit, new_position)
+        if self.debug_hash:
+            self.verify_hash()
+        
+        # Update valid actions
+        self.update_valid_actions()
+        return True
+
+    def attack_unit(self, target_position: Tuple[int, int]) -> bool:
+        """Attack a unit at the target position."""
+        if not self.selected_unit or target_position not in self.valid_attacks:
+            return False
+            
+        target_unit = self.units[target_position]
+        damage = self.selected_unit.get_attack_damage()
+        
+        # Apply damage, removing the unit if it dies
+        self._damage_unit(target_unit, damage)
+            
+        # Clear selection and valid actions
+        self.selected_unit = None
+        self.valid_moves = []
+        self.valid_attacks = []
+        self.valid_heals = []
+            
+        # End turn
+        self.end_turn()
+        return True
+
+    def heal_unit(self, target_position: Tuple[int, int]) -> bool:
+        """Heal a unit at the target position."""
+        if not self.selected_unit or target_position not in self.valid_heals:
+            return False
+            
+        target_unit = self.units[target_position]
+        
+        # Check if target unit is already at full HP
+        if target_unit.hp >= target_unit.max_hp:
+            return False
+            
+        # Determine actual heal amount (min of HEALER_HEAL_COST or healer's current HP)
+        actual_heal = min(HEALER_HEAL_COST, self.selected_unit.hp)
+        
+        # Perform healing; the healer loses that much HP and is removed if it dies
+        self._heal_unit(self.selected_unit, target_unit, actual_heal)
+            
+        # End turn
+        self.end_turn()
+        return True
+
+    def apply_action(self, action: Action) -> bool:
+        """Play an action from legal_actions() and push an undo record.
+
+        Moves, attacks and heals all end the turn. Unlike move_unit/attack_unit/
+        heal_unit this neither validates the target nor touches the selection
+        state, so it can be rolled back exactly with undo_action().
+        """
+        if self.state not in (GameState.PLAYER_1_TURN, GameState.PLAYER_2_TURN):
+            return False
+        unit, action_type, target = action
+        if unit.player != self.current_player or self.units.get(unit.position) is not unit:
+            return False
+
+        origin = unit.position
+        unit_hp = unit.hp
+        piece_hash = self.piece_hash
+        mirror_piece_hash = self.mirror_piece_hash
+        target_unit = None
+        target_hp = 0
+        removed = None
+        if action_type == 'move':
+            self._relocate_unit(unit, target)
+        elif action_type == 'attack':
+            target_unit = self.units[target]
+            target_hp = target_unit.hp
+            self._damage_unit(target_unit, unit.get_attack_damage())
+            if not target_unit.alive:
+                removed = target_unit
+        elif action_type == 'heal':
+            target_unit = self.units[target]
+            target_hp = target_unit.hp
+            self._heal_unit(unit, target_unit, min(HEALER_HEAL_COST, unit.hp))
+            if not unit.alive:
+                removed = unit
+        else:
+            return False
+
+        self.undo_stack.append((action_type, unit, origin, unit_hp, target_unit, target_hp,
+                                removed, self.state, self.current_player, self.winner,
+                                piece_hash, mirror_piece_hash))
+        self._switch_turn()
+        if self.debug_hash:
+            self.verify_hash()
+        return True
+
+    def apply_pass(self) -> bool:
+        """Hand the turn over without acting, as a side with no legal action must, and push an undo record."""
+        if self.state not in (GameState.PLAYER_1_TURN, GameState.PLAYER_2_TURN):
+            return False
+        self.undo_stack.append(('pass', None, None, 0, None, 0, None, self.state, self.current_player,
+                                self.winner, self.piece_hash, self.mirror_piece_hash))
+        self._switch_turn()
+        if self.debug_hash:
+            self.verify_hash()
+        return True
+
+    def undo_action(self) -> bool:
+        """Take back the most recent apply_action() or apply_pass()."""
+        if not self.undo_stack:
+            return False
+        (action_type, unit, origin, unit_hp, target_unit, target_hp,
+         removed, state, player, winner, piece_hash, mirror_piece_hash) = self.undo_stack.pop()
+
+        self.state = state
+        self.current_player = player
+        self.winner = winner
+        if removed is not None:
+            removed.alive = True
+            self._add_unit(removed)
+        if action_type == 'move':
+            self._relocate_unit(unit, origin)
+        elif action_type != 'pass':
+            unit.hp = unit_hp
+            target_unit.hp = target_hp
+            target_unit.alive = True
+        # The HP changes above bypass the hashes, so restore them wholesale
+        self.piece_hash = piece_hash
+        self.mirror_piece_hash = mirror_piece_hash
+        if self.debug_hash:
+            self.verify_hash()
+        return True
+
+    def end_turn(self) -> None:
+        """End the current player's turn."""
+        self.selected_unit = None
+        self.valid_moves = []
+        self.valid_attacks = []
+        self.valid_heals = []
+        self._switch_turn()
+        if self.debug_hash:
+            self.verify_hash()
+
+    def _switch_turn(self) -> None:
+        """Hand the turn to the other player and check for a winner."""
+        if self.state == GameState.PLAYER_1_TURN:
+            self.state = GameState.PLAYER_2_TURN
+            self.current_player = 2
+        else:
+            self.state = GameState.PLAYER_1_TURN
+            self.current_player = 1
+            
+        self.check_game_over()
+
+    def check_game_over(self) -> None:
+        """Check if the game is over."""
+        # Check if crown is dead
+        if not self.crown_counts[1]:
+            self.state = GameState.GAME_OVER
+            self.winner = 2
+            return
+        elif not self.crown_counts[2]:
+            self.state = GameState.GAME_OVER
+            self.winner = 1
+            return
+        
+        # Check for no attacking units left (only crown, wall, healer)
+        for player in [1, 2]:
+            if not self.attacker_counts[player]:
+                # This player loses
+                self.state = GameState.GAME_OVER
+                self.winner = 2 if player == 1 else 1
+                return
+
+    @property
+    def zobrist_hash(self) -> int:
+        """64-bit hash of the position: every unit plus the side to move."""
+        return self.piece_hash ^ side_key(self.current_player)
+
+    @property
+    def mirrored_zobrist_hash(self) -> int:
+        """Hash the position would have with the board reflected left to right."""
+        return self.mirror_piece_hash ^ side_key(self.current_player)
+
+    def compute_hash(self) -> int:
+        """Recompute the position hash from scratch."""
+        piece_hash = 0
+        for unit in self.units.values():
+            piece_hash ^= unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+        return piece_hash ^ side_key(self.current_player)
+
+    def compute_mirrored_hash(self) -> int:
+        """Recompute the mirrored position hash from scratch."""
+        piece_hash = 0
+        for unit in self.units.values():
+            piece_hash ^= mirror_unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+        return piece_hash ^ side_key(self.current_player)
+
+    def verify_hash(self) -> None:
+        """Check the incremental hashes and bitboards against a full recompute."""
+        expected = self.compute_hash()
+        if self.zobrist_hash != expected:
+            raise RuntimeError(f"Zobrist hash out of sync: {self.zobrist_hash:#018x} != {expected:#018x}")
+        expected = self.compute_mirrored_hash()
+        if self.mirrored_zobrist_hash != expected:
+            raise RuntimeError(f"Mirrored Zobrist hash out of sync: "
+                               f"{self.mirrored_zobrist_hash:#018x} != {expected:#018x}")
+        expected = Bitboards.from_units(self.units.values())
+        if self.bitboards.players != expected.players or self.bitboards.types != expected.types:
+            raise RuntimeError("Bitboards out of sync with the units")
+
+    def to_bytes(self) -> bytes:
+        """Encode the units, state, player to move and winner as a compact versioned snapshot."""
+        pack = SNAPSHOT_UNIT.pack
+        parts = [SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, self.state.value, self.current_player,
+                                      self.winner or 0, len(self.units))]
+        # Records go in square order so equal positions always encode to equal bytes
+        squares = sorted(((y * BOARD_SIZE + x, unit) for (x, y), unit in self.units.items()), key=lambda item: item[0])
+        parts.extend([pack(unit.unit_type << 2 | unit.player, square, unit.hp) for square, unit in squares])
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'GameEngine':
+        """Rebuild an engine from to_bytes() output; selection and undo history start empty."""
+        version, state, current_player, winner, count = SNAPSHOT_HEADER.unpack_from(data)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        if len(data) != SNAPSHOT_HEADER.size + count * SNAPSHOT_UNIT.size:
+            raise ValueError("Snapshot length does not match its unit count")
+
+        engine = cls()
+        for packed, square, hp in SNAPSHOT_UNIT.iter_unpack(memoryview(data)[SNAPSHOT_HEADER.size:]):
+            unit = Unit(_UNIT_TYPES[packed >> 2], packed & 3, (square % BOARD_SIZE, square // BOARD_SIZE))
+            unit.hp = hp
+            engine._add_unit(unit)
+        engine.state = _GAME_STATES[state]
+        engine.current_player = current_player
+        engine.winner = winner or None
+        return engine
+
+    def _add_unit(self, unit: Unit) -> None:
+        """Put a unit on the board, keeping the bitboards and hash in sync."""
+        self.units[unit.position] = unit
+        self.bitboards.add(unit.unit_type, unit.player, unit.position)
+        self._count_unit(unit, 1)
+        self.piece_hash ^= unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+        self.mirror_piece_hash ^= mirror_unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+
+    def _remove_unit(self, unit: Unit) -> None:
+        """Take a unit off the board, keeping the bitboards and hash in sync."""
+        del self.units[unit.position]
+        self.bitboards.remove(unit.unit_type, unit.player, unit.position)
+        self._count_unit(unit, -1)
+        self.piece_hash ^= unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+        self.mirror_piece_hash ^= mirror_unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+
+    def _damage_unit(self, unit: Unit, damage: int) -> None:
+        """Apply damage to a unit, removing it from the board if it dies."""
+        old_key = unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+        old_mirror_key = mirror_unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+        unit.take_damage(damage)
+        self.piece_hash ^= old_key ^ unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+        self.mirror_piece_hash ^= (old_mirror_key
+                                   ^ mirror_unit_key(unit.unit_type, unit.player, unit.position, unit.hp))
+        if not unit.alive:
+            self._remove_unit(unit)
+
+    def _heal_unit(self, healer: Unit, target: Unit, amount: int) -> None:
+        """Heal a target at the healer's expense, removing the healer if it dies."""
+        for unit in (target, healer):
+            old_key = unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+            old_mirror_key = mirror_unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+            unit.heal(amount)
+            self.piece_hash ^= old_key ^ unit_key(unit.unit_type, unit.player, unit.position, unit.hp)
+            self.mirror_piece_hash ^= (old_mirror_key
+                                       ^ mirror_unit_key(unit.unit_type, unit.player, unit.position, unit.hp))
+        if not healer.alive:
+            self._remove_unit(healer)
+
+    def _count_unit(self, unit: Unit, delta: int) -> None:
+        """Adjust the crown and attacker counters for a unit entering or leaving the board."""
+        if unit.unit_type == UnitType.CROWN:
+            self.crown_counts[unit.player] += delta
+        elif unit.unit_type in ATTACKING_TYPES:
+            self.attacker_counts[unit.player] += delta
+
+    def _relocate_unit(self, unit: Unit, new_position: Tuple[int, int]) -> None:
+        """Move a unit to another square, keeping the bitboards and hash in sync."""
+        old_position = unit.position
+        del self.units[old_position]
+        unit.move(new_position)
+        self.units[new_position] = unit
+        self.bitboards.move(unit.unit_type, unit.player, old_position, new_position)
+        self.piece_hash ^= (unit_key(unit.unit_type, unit.player, old_position, unit.hp)
+                            ^ unit_key(unit.unit_type, unit.player, new_position, unit.hp))
+        self.mirror_piece_hash ^= (mirror_unit_key(unit.unit_type, unit.player, old_position, unit.hp)
+                                   ^ mirror_unit_key(unit.unit_type, unit.player, new_position, unit.hp))
+
+    def get_unit_at(self, position: Tuple[int, int]) -> Optional[Unit]:
+        """Get the unit at a specific position."""
+        return self.units.get(position)
+
+    def get_all_units(self) -> List[Unit]:
+        """Get all units on the board."""
+        return list(self.units.values()) 
\ No newline at end of file
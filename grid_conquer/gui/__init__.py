@@ -0,0 +1,21 @@
+"""
+Front ends for Grid Conquer: the pygame UI and the tkinter UI, with or without the AI.
+
+Each class is imported on first access, so importing this package does not pull
+in pygame, tkinter or PIL until one of them is actually used.
+"""
+import importlib
+
+# Exported name -> module that defines it
+_EXPORTS = {
+    'GameUI': 'ui',
+    'GridConquerUI': 'tkinter_ui',
+    'GridConquerUIAI': 'tkinter_ui_ai',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module('.' + _EXPORTS[name], __name__), name)
@@ -0,0 +1,141 @@
+import tkinter as tk
+from typing import Callable, Dict, Optional, Tuple
+from ..constants import BOARD_SIZE
+
+# Gap around each cell, matching the widget grid's padx/pady
+CELL_PADDING = 3
+# Offset of the unit tile from the cell's top-left corner
+TILE_INSET = 4
+BOARD_COLOR = "#90caf9"
+HP_BAR_COLOR = '#FFD600'
+HP_BACKGROUND_COLOR = '#f5f5f5'
+
+class BoardCanvas(tk.Canvas):
+    """
+    The game board drawn on a single canvas instead of a grid of 192 widgets.
+    Every cell owns a fixed set of tagged items (tile, unit image, HP bar and text) that are
+    reconfigured in place, and clicks and hovers are mapped to cells from their coordinates.
+    """
+    def __init__(self, parent, cell_size: int, btn_size: int, hp_bar_width: int, hp_bar_height: int,
+                 tile_colors, images: Dict[str, tk.PhotoImage], on_click: Callable[[int, int], None]):
+        self.btn_size = btn_size
+        self.hp_bar_width = hp_bar_width
+        self.hp_bar_height = hp_bar_height
+        self.pitch_x = cell_size + 2 * CELL_PADDING
+        self.pitch_y = cell_size + hp_bar_height + 2 * CELL_PADDING
+        super().__init__(parent, width=self.pitch_x * BOARD_SIZE, height=self.pitch_y * BOARD_SIZE,
+                         bg=BOARD_COLOR, bd=0, highlightthickness=0)
+        self.images = images
+        self.on_click = on_click
+        self.hp_radius = max(9, hp_bar_height // 2)
+        self.hp_font = ('Segoe UI', max(9, hp_bar_height // 2), 'bold')
+        # Tile (background, hover background) per cell; the hover color shows under the pointer
+        self.tile_fills = [[(tile_colors[(x + y) % 2], BOARD_COLOR) for x in range(BOARD_SIZE)] for y in range(BOARD_SIZE)]
+        self.hovered: Optional[Tuple[int, int]] = None
+        self.cells = []
+        for y in range(BOARD_SIZE):
+            row = []
+            for x in range(BOARD_SIZE):
+                row.append(self.create_cell(x, y, cell_size, tile_colors[(x + y) % 2]))
+            self.cells.append(row)
+        self.bind('<Button-1>', self.on_press)
+        self.bind('<Motion>', self.on_motion)
+        self.bind('<Leave>', self.on_leave)
+
+    def cell_origin(self, x: int, y: int) -> Tuple[int, int]:
+        """Canvas coordinates of a cell's top-left corner."""
+        return x * self.pitch_x + CELL_PADDING, y * self.pitch_y + CELL_PADDING
+
+    def create_cell(self, x: int, y: int, cell_size: int, color: str) -> Tuple[int, ...]:
+        """Create a cell's items once; later updates only reconfigure them."""
+        left, top = self.cell_origin(x, y)
+        cell_tag = f"cell_{x}_{y}"
+        self.create_rectangle(left, top, left + cell_size, top + cell_size + self.hp_bar_height,
+                              fill=color, outline='', width=0, tags=('cell', cell_tag))
+        tile_left, tile_top = left + TILE_INSET, top + TILE_INSET
+        tile = self.create_rectangle(tile_left, tile_top, tile_left + self.btn_size, tile_top + self.btn_size,
+                                     fill=color, outline='', width=0, tags=('tile', cell_tag))
+        image = self.create_image(tile_left + self.btn_size // 2, tile_top + self.btn_size // 2,
+                                  state=tk.HIDDEN, tags=('unit', cell_tag))
+        bar_top = top + self.btn_size + 6
+        bar_bottom = bar_top + self.hp_bar_height
+        self.create_rectangle(tile_left, bar_top, tile_left + self.hp_bar_width, bar_bottom,
+                              fill=HP_BACKGROUND_COLOR, outline='', width=0, tags=('hp_background', cell_tag))
+        bar = self.create_rectangle(tile_left, bar_top, tile_left, bar_bottom, fill=HP_BAR_COLOR,
+                                    outline='', width=0, state=tk.HIDDEN, tags=('hp_bar', cell_tag))
+        bar_start = self.create_oval(tile_left, bar_top, tile_left + 2 * self.hp_radius, bar_bottom, fill=HP_BAR_COLOR,
+                                     outline='', state=tk.HIDDEN, tags=('hp_bar', cell_tag))
+        bar_end = self.create_oval(tile_left, bar_top, tile_left, bar_bottom, fill=HP_BAR_COLOR,
+                                   outline='', state=tk.HIDDEN, tags=('hp_bar', cell_tag))
+        text = self.create_text(tile_left + self.hp_bar_width // 2, bar_top + self.hp_bar_height // 2, text="",
+                                fill='black', font=self.hp_font, state=tk.HIDDEN, tags=('hp_text', cell_tag))
+        return tile, image, bar, bar_start, bar_end, text
+
+    def cell_at(self, canvas_x: int, canvas_y: int) -> Optional[Tuple[int, int]]:
+        """The cell whose tile contains a canvas point, or None for gaps, HP bars and off-board points."""
+        x, offset_x = divmod(canvas_x - CELL_PADDING - TILE_INSET, self.pitch_x)
+        y, offset_y = divmod(canvas_y - CELL_PADDING - TILE_INSET, self.pitch_y)
+        if 0 <= x < BOARD_SIZE and 0 <= y < BOARD_SIZE and offset_x < self.btn_size and offset_y < self.btn_size:
+            return x, y
+        return None
+
+    def cell_at_root(self, root_x: int, root_y: int) -> Optional[Tuple[int, int]]:
+        """The cell under a screen position, as reported by drag-and-drop events."""
+        return self.cell_at(root_x - self.winfo_rootx(), root_y - self.winfo_rooty())
+
+    def draw_cell_content(self, x: int, y: int, content: Optional[Tuple[str, int, int]]):
+        """Show a unit's image and HP bar in a cell, or clear it when content is None."""
+        tile, image, bar, bar_start, bar_end, text = self.cells[y][x]
+        if content is None:
+            self.itemconfigure(image, state=tk.HIDDEN)
+            for item in (bar, bar_start, bar_end, text):
+                self.itemconfigure(item, state=tk.HIDDEN)
+            return
+
+        image_key, hp, max_hp = content
+        self.itemconfigure(image, image=self.images.get(image_key, ''), state=tk.NORMAL)
+        left, top = self.cell_origin(x, y)
+        bar_left, bar_top = left + TILE_INSET, top + self.btn_size + 6
+        bar_length = int(self.hp_bar_width * (hp / max_hp))
+        if bar_length > 0:
+            self.coords(bar, bar_left, bar_top, bar_left + bar_length, bar_top + self.hp_bar_height)
+            self.itemconfigure(bar, state=tk.NORMAL)
+            self.itemconfigure(bar_start, state=tk.NORMAL)
+        else:
+            self.itemconfigure(bar, state=tk.HIDDEN)
+            self.itemconfigure(bar_start, state=tk.HIDDEN)
+        if bar_length > self.hp_radius:
+            self.coords(bar_end, bar_left + bar_length - 2 * self.hp_radius, bar_top,
+                        bar_left + bar_length, bar_top + self.hp_bar_height)
+            self.itemconfigure(bar_end, state=tk.NORMAL)
+        else:
+            self.itemconfigure(bar_end, state=tk.HIDDEN)
+        self.itemconfigure(text, text=f"{hp}/{max_hp}", state=tk.NORMAL)
+
+    def draw_cell_highlight(self, x: int, y: int, background: str, hover_background: str):
+        """Color a cell's tile; the hovered cell keeps its hover color until the pointer leaves."""
+        self.tile_fills[y][x] = (background, hover_background)
+        self.itemconfigure(self.cells[y][x][0], fill=hover_background if self.hovered == (x, y) else background)
+
+    def set_hovered(self, cell: Optional[Tuple[int, int]]):
+        """Move the hover color to another cell (or to none)."""
+        if cell == self.hovered:
+            return
+        if self.hovered is not None:
+            x, y = self.hovered
+            self.itemconfigure(self.cells[y][x][0], fill=self.tile_fills[y][x][0])
+        if cell is not None:
+            x, y = cell
+            self.itemconfigure(self.cells[y][x][0], fill=self.tile_fills[y][x][1])
+        self.hovered = cell
+
+    def on_press(self, event):
+        cell = self.cell_at(event.x, event.y)
+        if cell is not None:
+            self.on_click(*cell)
+
+    def on_motion(self, event):
+        self.set_hovered(self.cell_at(event.x, event.y))
+
+    def on_leave(self, event):
+        self.set_hovered(None)
@@ -1,13 +1,27 @@
+import argparse
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
 import os
-from typing import Tuple, Optional
-from constants import (
+from typing import Dict, Tuple, Optional
+from ..constants import (
     BOARD_SIZE, PLAYER1_COLOR, PLAYER2_COLOR,
     GameState, UnitType, HEAL_AMOUNT, HEALER_HEAL_COST
 )
-from game_engine import GameEngine
+from ..game_engine import GameEngine
+from .tkinter_board import BoardCanvas
+
+# Button (background, active background) for each highlight kind
+HIGHLIGHT_COLORS = {
+    'move': ("#a5d6a7", "#81c784"),
+    'attack': ("#ef9a9a", "#e57373"),
+    'heal': ("#b3e5fc", "#4fc3f7"),
+    'heal_blocked': ("#eeeeee", "#eeeeee"),
+}
+# 'widgets' builds a Frame, Button and HP Canvas per cell; 'canvas' draws the board on one BoardCanvas
+BOARD_RENDERERS = ('widgets', 'canvas')
+# Marks a cell that has not been drawn yet, so the first update_board draws it
+UNRENDERED = object()
 
 class DraggableUnit(tk.Label):
     def __init__(self, parent, image, unit_type, player, **kwargs):
@@ -30,7 +44,11 @@ class DraggableUnit(tk.Label):
     def stop_drag(self, event):
         # Get the widget under the cursor
         widget = event.widget.winfo_containing(event.x_root, event.y_root)
-        if isinstance(widget, ttk.Button) and hasattr(widget, 'grid_info'):
+        if isinstance(widget, BoardCanvas):
+            cell = widget.cell_at_root(event.x_root, event.y_root)
+            if cell:
+                self.master.handle_unit_placement(self.unit_type, cell)
+        elif isinstance(widget, ttk.Button) and hasattr(widget, 'grid_info'):
             # Get grid coordinates
             grid_info = widget.grid_info()
             if grid_info:
@@ -41,7 +59,10 @@ class DraggableUnit(tk.Label):
         self.place_forget()
 
 class GridConquerUI:
-    def __init__(self):
+    def __init__(self, board_renderer: str = 'widgets'):
+        if board_renderer not in BOARD_RENDERERS:
+            raise ValueError(f"Unknown board renderer {board_renderer!r}; expected one of {BOARD_RENDERERS}")
+        self.board_renderer = board_renderer
         self.root = tk.Tk()
         self.root.title("Grid Conquer")
         self.root.resizable(False, False)
@@ -93,8 +114,9 @@ class GridConquerUI:
         # Initialize game engine
         self.game_engine = GameEngine()
         
-        # Create board buttons
+        # Create board buttons (or the single board canvas)
         self.board_buttons = []
+        self.board_canvas: Optional[BoardCanvas] = None
         self.create_board()
         
         # Create troop selection panel
@@ -142,6 +164,15 @@ class GridConquerUI:
     def create_board(self):
         """Create the game board with buttons and modern appearance."""
         self.tile_colors = ["#e3f2fd", "#bbdefb"]  # Soft blue and lighter blue
+        # What each cell currently shows, so update_board only touches cells that changed
+        self.cell_contents = [[UNRENDERED] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        self.cell_highlight_kinds = [[UNRENDERED] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        self.cell_backgrounds = [[self.tile_colors[(x + y) % 2] for x in range(BOARD_SIZE)] for y in range(BOARD_SIZE)]
+        if self.board_renderer == 'canvas':
+            self.board_canvas = BoardCanvas(self.board_frame, self.cell_size, self.btn_size, self.hp_bar_width,
+                                            self.hp_bar_height, self.tile_colors, self.images, self.handle_click)
+            self.board_canvas.grid(row=0, column=0)
+            return
         for y in range(BOARD_SIZE):
             row = []
             for x in range(BOARD_SIZE):
@@ -164,7 +195,8 @@ class GridConquerUI:
                 )
                 btn.place(x=4, y=4, width=self.btn_size, height=self.btn_size)
                 btn.bind('<Enter>', lambda e, b=btn: b.config(bg="#b3e5fc"))
-                btn.bind('<Leave>', lambda e, b=btn, c=self.tile_colors[(x + y) % 2]: b.config(bg=c))
+                # Leaving restores the cell's current color, highlight included
+                btn.bind('<Leave>', lambda e, b=btn, x=x, y=y: b.config(bg=self.cell_backgrounds[y][x]))
                 
                 # Create HP bar canvas (for custom color and text)
                 hp_canvas = tk.Canvas(cell_frame, width=self.hp_bar_width, height=self.hp_bar_height, bg='#f5f5f5', highlightthickness=0, bd=0)
@@ -248,60 +280,82 @@ class GridConquerUI:
         )
         self.moves_info.grid(row=2, column=0, pady=10)
         
+    def cell_highlights(self) -> Dict[Tuple[int, int], str]:
+        """Highlight kind of every cell the selected unit can act on."""
+        engine = self.game_engine
+        if not engine.selected_unit:
+            return {}
+        highlights = {}
+        # Later kinds overwrite earlier ones: a move beats an attack beats a heal
+        can_heal = engine.selected_unit.hp > HEALER_HEAL_COST
+        for position in engine.valid_heals:
+            # Check if target can be healed
+            target_unit = engine.units.get(position)
+            healable = target_unit and target_unit.hp < target_unit.max_hp and can_heal
+            highlights[position] = 'heal' if healable else 'heal_blocked'
+        for position in engine.valid_attacks:
+            highlights[position] = 'attack'
+        for position in engine.valid_moves:
+            highlights[position] = 'move'
+        return highlights
+
     def update_board(self):
-        """Update the game board display."""
+        """Update the game board display, reconfiguring only the cells whose contents changed."""
+        highlights = self.cell_highlights()
+        units = self.game_engine.units
         for y in range(BOARD_SIZE):
             for x in range(BOARD_SIZE):
-                btn, hp_canvas, cell_frame = self.board_buttons[y][x]
-                unit = self.game_engine.get_unit_at((x, y))
-                
-                # Set cell background
-                cell_frame.config(bg=self.tile_colors[(x + y) % 2])
-                btn.config(bg=self.tile_colors[(x + y) % 2], activebackground="#90caf9")
-                
+                unit = units.get((x, y))
                 if unit and unit.alive:
-                    # Set unit image based on type and player
-                    image_key = f"{unit.unit_type.name.lower()}_{unit.player}"
-                    btn.config(image=self.images.get(image_key, ''), text="", relief=tk.FLAT)
-                    
-                    # Draw yellow HP bar with value inside
-                    hp_canvas.delete("all")
-                    hp_percentage = (unit.hp / unit.max_hp)
-                    bar_length = int(self.hp_bar_width * hp_percentage)
-                    r = max(9, self.hp_bar_height // 2)
-                    if bar_length > 0:
-                        hp_canvas.create_rectangle(0, 0, bar_length, self.hp_bar_height, fill='#FFD600', outline='', width=0)
-                        hp_canvas.create_oval(0, 0, r*2, self.hp_bar_height, fill='#FFD600', outline='')
-                        if bar_length > r:
-                            hp_canvas.create_oval(bar_length-r*2, 0, bar_length, self.hp_bar_height, fill='#FFD600', outline='')
-                    hp_text = f"{unit.hp}/{unit.max_hp}"
-                    hp_canvas.create_text(self.hp_bar_width//2, self.hp_bar_height//2, text=hp_text, fill='black', font=('Segoe UI', max(9, self.hp_bar_height//2), 'bold'))
-                    hp_canvas.grid()
-                else:
-                    btn.config(image='', text="", relief=tk.FLAT)
-                    hp_canvas.delete("all")
-                    hp_canvas.grid_remove()
-                
-                # Update button style based on valid actions
-                if self.game_engine.selected_unit:
-                    if (x, y) in self.game_engine.valid_moves:
-                        btn.config(bg="#a5d6a7", activebackground="#81c784")
-                    elif (x, y) in self.game_engine.valid_attacks:
-                        btn.config(bg="#ef9a9a", activebackground="#e57373")
-                    elif (x, y) in self.game_engine.valid_heals:
-                        # Check if target can be healed
-                        target_unit = self.game_engine.get_unit_at((x, y))
-                        if (target_unit and 
-                            target_unit.hp < target_unit.max_hp and 
-                            self.game_engine.selected_unit.hp > HEALER_HEAL_COST):
-                            btn.config(bg="#b3e5fc", activebackground="#4fc3f7")
-                        else:
-                            btn.config(bg="#eeeeee", activebackground="#eeeeee")
-                    else:
-                        btn.config(bg=self.tile_colors[(x + y) % 2], activebackground="#90caf9")
+                    content = (f"{unit.unit_type.name.lower()}_{unit.player}", unit.hp, unit.max_hp)
                 else:
-                    btn.config(bg=self.tile_colors[(x + y) % 2], activebackground="#90caf9")
-                    
+                    content = None
+                if content != self.cell_contents[y][x]:
+                    self.draw_cell_content(x, y, content)
+                    self.cell_contents[y][x] = content
+                highlight = highlights.get((x, y))
+                if highlight != self.cell_highlight_kinds[y][x]:
+                    self.draw_cell_highlight(x, y, highlight)
+                    self.cell_highlight_kinds[y][x] = highlight
+
+    def draw_cell_content(self, x: int, y: int, content: Optional[Tuple[str, int, int]]):
+        """Show a unit's image and HP bar in a cell, or clear it when content is None."""
+        if self.board_canvas:
+            self.board_canvas.draw_cell_content(x, y, content)
+            return
+        btn, hp_canvas, cell_frame = self.board_buttons[y][x]
+        if content is None:
+            btn.config(image='', text="", relief=tk.FLAT)
+            hp_canvas.delete("all")
+            hp_canvas.grid_remove()
+            return
+
+        image_key, hp, max_hp = content
+        btn.config(image=self.images.get(image_key, ''), text="", relief=tk.FLAT)
+        
+        # Draw yellow HP bar with value inside
+        hp_canvas.delete("all")
+        hp_percentage = (hp / max_hp)
+        bar_length = int(self.hp_bar_width * hp_percentage)
+        r = max(9, self.hp_bar_height // 2)
+        if bar_length > 0:
+            hp_canvas.create_rectangle(0, 0, bar_length, self.hp_bar_height, fill='#FFD600', outline='', width=0)
+            hp_canvas.create_oval(0, 0, r*2, self.hp_bar_height, fill='#FFD600', outline='')
+            if bar_length > r:
+                hp_canvas.create_oval(bar_length-r*2, 0, bar_length, self.hp_bar_height, fill='#FFD600', outline='')
+        hp_text = f"{hp}/{max_hp}"
+        hp_canvas.create_text(self.hp_bar_width//2, self.hp_bar_height//2, text=hp_text, fill='black', font=('Segoe UI', max(9, self.hp_bar_height//2), 'bold'))
+        hp_canvas.grid()
+
+    def draw_cell_highlight(self, x: int, y: int, highlight: Optional[str]):
+        """Color a cell's button for a highlight kind, or back to the tile color for None."""
+        background, active_background = HIGHLIGHT_COLORS.get(highlight, (self.tile_colors[(x + y) % 2], "#90caf9"))
+        self.cell_backgrounds[y][x] = background
+        if self.board_canvas:
+            self.board_canvas.draw_cell_highlight(x, y, background, active_background)
+            return
+        self.board_buttons[y][x][0].config(bg=background, activebackground=active_background)
+
     def update_info_panel(self):
         """Update the information panel."""
         # Update game state
@@ -461,5 +515,8 @@ class GridConquerUI:
         self.root.mainloop()
 
 if __name__ == "__main__":
-    game = GridConquerUI()
+    parser = argparse.ArgumentParser(description="Play Grid Conquer")
+    parser.add_argument('--board', choices=BOARD_RENDERERS, default='widgets', help="board renderer")
+    args = parser.parse_args()
+    game = GridConquerUI(args.board)
     game.run() 
\ No newline at end of file
@@ -0,0 +1,205 @@
+import argparse
+import os
+import queue
+import sys
+import threading
+import traceback
+from tkinter import ttk
+from typing import Optional
+from .tkinter_ui import BOARD_RENDERERS, GridConquerUI
+from ..agents import RLAgent, create_agent
+from ..constants import GameState, PLACEMENT_ORDER
+from ..game_engine import GameEngine
+from ..placement import DEFAULT_BOOK_PATH, OpeningBook
+from ..instrumentation import enable_from_environment
+
+AI_AGENTS = ('alphabeta', 'mcts', 'heuristic')
+# How often (ms) the Tk loop checks for the worker's decision while a search runs.
+# The worker may not touch Tk, and Tk has no portable way for another thread to wake
+# its loop, so the Tk loop polls the result queue instead; the timer only runs while a
+# search is in flight, and a check is one empty-queue test, well under a frame's work
+AI_RESULT_POLL_MS = 15
+# GIL switch interval (seconds) while a search thread shares the interpreter with the UI;
+# Python's 5 ms default lets a busy search delay Tk callbacks by close to a 60 fps frame.
+# Set only while a search runs, then the previous value is restored
+AI_SWITCH_INTERVAL = 0.001
+# Seconds on_closing waits for a cancelled search to unwind
+WORKER_JOIN_TIMEOUT = 1.0
+
+class GridConquerUIAI(GridConquerUI):
+    def __init__(self, agent: str = 'alphabeta', time_limit: float = 1.0, iterations: Optional[int] = None,
+                 board_renderer: str = 'widgets', batch_rollouts: Optional[int] = None):
+        super().__init__(board_renderer)
+        # time_limit is the per-move budget in seconds
+        self.ai_agent = create_agent(agent, self.game_engine, time_limit, iterations, batch_rollouts=batch_rollouts)
+        # Player 2's placements come from the precomputed book (see placement.py)
+        if os.path.exists(DEFAULT_BOOK_PATH):
+            self.opening_book = OpeningBook.load(DEFAULT_BOOK_PATH)
+        else:
+            print(f"No opening book at {DEFAULT_BOOK_PATH}; run python -m grid_conquer.placement to build one")
+            self.opening_book = OpeningBook.empty()
+        self.is_ai_turn = False
+        # Plays for the AI when a search fails, so its turn always finishes
+        self.fallback_agent = RLAgent(self.game_engine)
+        # Searches run on a worker thread against a snapshot copy of the engine. The worker
+        # never calls Tk; it only queues its decision, which poll_ai_result picks up
+        self.ai_thread: Optional[threading.Thread] = None
+        self.ai_results: queue.Queue = queue.Queue()
+        self.ai_stop = threading.Event()
+        if hasattr(self.ai_agent, 'stop_event'):
+            self.ai_agent.stop_event = self.ai_stop
+        self.ai_poll_id: Optional[str] = None
+        self.ai_turn_pending = False
+        # Interpreter switch interval to restore once the running search is done
+        self.saved_switch_interval: Optional[float] = None
+        self.create_thinking_indicator()
+
+    def create_thinking_indicator(self):
+        """Create the (initially hidden) indicator shown while the AI searches."""
+        self.thinking_label = ttk.Label(self.info_frame, text="AI is thinking...", style='Info.TLabel')
+        self.thinking_bar = ttk.Progressbar(self.info_frame, mode='indeterminate', length=160)
+        self.thinking_label.grid(row=3, column=0, pady=(10, 0))
+        self.thinking_bar.grid(row=4, column=0, pady=5)
+        self.set_thinking(False)
+
+    def set_thinking(self, thinking: bool):
+        """Show and animate, or stop and hide, the thinking indicator."""
+        if thinking:
+            self.thinking_label.grid()
+            self.thinking_bar.grid()
+            self.thinking_bar.start(15)
+        else:
+            self.thinking_bar.stop()
+            self.thinking_label.grid_remove()
+            self.thinking_bar.grid_remove()
+
+    def update_display(self):
+        """Update the display, then give the AI its turn once the Tk loop is idle."""
+        super().update_display()
+        if not self.ai_turn_pending:
+            self.ai_turn_pending = True
+            self.root.after_idle(self.check_ai_turn)
+
+    def check_ai_turn(self):
+        self.ai_turn_pending = False
+        if self.game_engine.state == GameState.PLACEMENT_PHASE and self.game_engine.current_player == 2:
+            self.ai_place()
+        elif self.game_engine.state == GameState.PLAYER_2_TURN:
+            # A search already in flight answers for this position
+            if self.ai_thread is None:
+                self.start_ai_search()
+        else:
+            self.is_ai_turn = False
+
+    def handle_click(self, x: int, y: int):
+        """Ignore board clicks while the AI is choosing its move."""
+        if self.is_ai_turn:
+            return
+        super().handle_click(x, y)
+
+    def ai_place(self):
+        placement = self.opening_book.next_placement(self.game_engine)
+        if placement is None or not self.game_engine.place_unit(*placement, 2):
+            return
+        self.game_engine.current_player = 1
+        if len(self.game_engine.units) == 2 * len(PLACEMENT_ORDER):
+            self.game_engine.start_game()
+        self.update_troop_panel()
+        self.update_display()
+
+    def start_ai_search(self):
+        """Search a snapshot of the current position on a worker thread."""
+        self.is_ai_turn = True
+        self.set_thinking(True)
+        snapshot = self.game_engine.to_bytes()
+        self.saved_switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(AI_SWITCH_INTERVAL)
+        self.ai_thread = threading.Thread(target=self.search_worker, args=(snapshot,),
+                                          name="ai-search", daemon=True)
+        self.ai_thread.start()
+        self.ai_poll_id = self.root.after(AI_RESULT_POLL_MS, self.poll_ai_result)
+
+    def search_worker(self, snapshot: bytes):
+        """Worker thread: choose an action on a private engine and queue it for the Tk loop."""
+        try:
+            self.ai_agent.game_engine = GameEngine.from_bytes(snapshot)
+            action = self.ai_agent.choose_action()
+            report = self.ai_agent.report() if hasattr(self.ai_agent, 'report') else None
+            self.ai_results.put((snapshot, action, report))
+        except Exception as e:
+            self.ai_results.put((snapshot, e, None))
+
+    def poll_ai_result(self):
+        """Apply the worker's decision once it is queued; until then check again next frame."""
+        try:
+            snapshot, action, report = self.ai_results.get_nowait()
+        except queue.Empty:
+            self.ai_poll_id = self.root.after(AI_RESULT_POLL_MS, self.poll_ai_result)
+            return
+        self.ai_poll_id = None
+        self.ai_thread = None
+        self.restore_switch_interval()
+        self.is_ai_turn = False
+        self.set_thinking(False)
+        if isinstance(action, Exception):
+            print("AI search failed; playing the heuristic agent's move instead")
+            traceback.print_exception(type(action), action, action.__traceback__)
+            self.ai_move(self.fallback_agent.choose_action())
+            return
+        if report:
+            print(f"AI search: {report}")
+        if snapshot != self.game_engine.to_bytes():
+            # The position changed under the search; look again
+            self.update_display()
+            return
+        self.ai_move(action)
+
+    def restore_switch_interval(self):
+        """Put back the interpreter switch interval that was in effect before the search."""
+        if self.saved_switch_interval is not None:
+            sys.setswitchinterval(self.saved_switch_interval)
+            self.saved_switch_interval = None
+
+    def ai_move(self, action):
+        if self.game_engine.state != GameState.PLAYER_2_TURN:
+            return
+        if action is None:
+            self.game_engine.end_turn()
+            self.update_display()
+            return
+        searched_unit, action_type, target = action
+        # The action holds the snapshot's unit; act with ours on the same square
+        unit = self.game_engine.units[searched_unit.position]
+        self.game_engine.selected_unit = unit
+        self.game_engine.update_valid_actions()
+        if action_type == 'attack':
+            self.game_engine.attack_unit(target)
+        elif action_type == 'move':
+            self.game_engine.move_unit(target)
+            self.game_engine.end_turn()
+        elif action_type == 'heal':
+            self.game_engine.heal_unit(target)
+        self.update_display()
+
+    def on_closing(self):
+        """Cancel any running search before closing the window."""
+        self.ai_stop.set()
+        if self.ai_poll_id is not None:
+            self.root.after_cancel(self.ai_poll_id)
+        if self.ai_thread is not None:
+            self.ai_thread.join(WORKER_JOIN_TIMEOUT)
+        self.restore_switch_interval()
+        super().on_closing()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Grid Conquer against the AI")
+    parser.add_argument('--agent', choices=AI_AGENTS, default='alphabeta')
+    parser.add_argument('--time-limit', type=float, default=1.0, help="seconds per AI move")
+    parser.add_argument('--iterations', type=int, default=None, help="MCTS iterations per move")
+    parser.add_argument('--batch-rollouts', type=int, default=None,
+                        help="MCTS rollouts per leaf, played together with NumPy")
+    parser.add_argument('--board', choices=BOARD_RENDERERS, default='widgets', help="board renderer")
+    args = parser.parse_args()
+    enable_from_environment()
+    game = GridConquerUIAI(args.agent, args.time_limit, args.iterations, args.board, args.batch_rollouts)
+    game.run()
@@ -0,0 +1,345 @@
+import pygame
+import pygame.freetype
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from ..constants import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE, MAX_FPS,
+    TILE_SIZE, BOARD_SIZE,
+    PLAYER1_COLOR, PLAYER2_COLOR,
+    GRID_BG_COLOR, GRID_LINE_COLOR,
+    SELECTED_COLOR, VALID_MOVE_COLOR, VALID_ATTACK_COLOR,
+    VALID_HEAL_COLOR, GameState, UnitType
+)
+from ..game_engine import GameEngine
+from ..units import Unit
+
+# Where the status line is drawn, over the bottom row of the board
+STATUS_POSITION = (10, WINDOW_HEIGHT - 30)
+# Events after which the whole window has to be repainted
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED)
+
+# Health bars kept before the least recently used one is dropped
+HEALTH_BAR_CACHE_SIZE = 32
+
+HIGHLIGHT_COLORS = {'move': VALID_MOVE_COLOR, 'attack': VALID_ATTACK_COLOR, 'heal': VALID_HEAL_COLOR}
+
+# What a tile shows: (unit symbol, owner, hp, max hp, highlight); empty tiles
+# without a highlight are left out of a frame's tiles
+TileState = Tuple[Optional[str], int, int, int, Optional[str]]
+
+class GameUI:
+    """
+    Pygame front end for two players at one machine.
+    In event-driven mode (the default) run() sleeps in pygame.event.wait()
+    until input arrives, redraws only the tiles whose contents changed and
+    never redraws more than max_fps times a second. The legacy mode repaints
+    the whole window every loop iteration.
+    """
+    def __init__(self, event_driven: bool = True, max_fps: int = MAX_FPS):
+        pygame.init()
+        pygame.freetype.init()
+        
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption(WINDOW_TITLE)
+        
+        self.font = pygame.freetype.SysFont('Arial', 24)
+        self.unit_font = pygame.freetype.SysFont('Arial', 32)
+        
+        self.game_engine = GameEngine()
+        self.running = True
+        self.selected_position: Optional[Tuple[int, int]] = None
+        self.event_driven = event_driven
+        self.max_fps = max_fps
+        # Tiles and status text currently on screen, for finding what changed
+        self.rendered: Tuple[Dict[Tuple[int, int], TileState], str] = ({}, '')
+
+        # Pre-rendered surfaces, so a frame is mostly blits
+        self.background = self.render_background()
+        self.unit_tiles: Dict[Tuple[UnitType, int], pygame.Surface] = {}
+        self.health_bars: 'OrderedDict[int, pygame.Surface]' = OrderedDict()
+        self.status_tile_cache: Dict[str, Set[Tuple[int, int]]] = {}
+
+    def render_background(self) -> pygame.Surface:
+        """The empty board: background color and grid lines."""
+        background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        background.fill(GRID_BG_COLOR)
+        for i in range(BOARD_SIZE + 1):
+            # Vertical lines
+            pygame.draw.line(
+                background,
+                GRID_LINE_COLOR,
+                (i * TILE_SIZE, 0),
+                (i * TILE_SIZE, WINDOW_HEIGHT)
+            )
+            # Horizontal lines
+            pygame.draw.line(
+                background,
+                GRID_LINE_COLOR,
+                (0, i * TILE_SIZE),
+                (WINDOW_WIDTH, i * TILE_SIZE)
+            )
+        return background
+
+    def draw_grid(self):
+        """Draw the game grid."""
+        self.screen.blit(self.background, (0, 0))
+
+    def unit_tile(self, unit: Unit) -> pygame.Surface:
+        """A board tile with the unit's symbol on it, rendered once per unit type and player."""
+        key = (unit.unit_type, unit.player)
+        tile = self.unit_tiles.get(key)
+        if tile is None:
+            # Every tile's background is the same, so the symbol is drawn onto a copy of the first one
+            tile = self.background.subsurface((0, 0, TILE_SIZE, TILE_SIZE)).copy()
+            color = PLAYER1_COLOR if unit.player == 1 else PLAYER2_COLOR
+            self.unit_font.render_to(tile, (TILE_SIZE // 2 - 10, TILE_SIZE // 2 - 15), unit.get_symbol(), color)
+            self.unit_tiles[key] = tile
+        return tile
+
+    def health_bar(self, width: int) -> pygame.Surface:
+        """A health bar filled `width` pixels, from a small least-recently-used cache."""
+        bar = self.health_bars.get(width)
+        if bar is not None:
+            self.health_bars.move_to_end(width)
+            return bar
+        bar = pygame.Surface((TILE_SIZE - 10, 5)).convert()
+        bar.fill((200, 200, 200))
+        bar.fill((0, 255, 0), (0, 0, width, 5))
+        self.health_bars[width] = bar
+        if len(self.health_bars) > HEALTH_BAR_CACHE_SIZE:
+            self.health_bars.popitem(last=False)
+        return bar
+
+    def draw_unit(self, unit: Unit):
+        """Draw a unit on the board."""
+        x, y = unit.position
+        self.screen.blit(self.unit_tile(unit), (x * TILE_SIZE, y * TILE_SIZE))
+        # HP is quantized to the bar's pixel width, so units with nearly equal HP share a bar
+        health_width = int((unit.hp / unit.max_hp) * (TILE_SIZE - 10))
+        self.screen.blit(self.health_bar(health_width), (x * TILE_SIZE + 5, y * TILE_SIZE + 5))
+
+    def draw_highlight(self, position: Tuple[int, int], color: Tuple[int, int, int]):
+        """Outline one tile in a highlight color."""
+        x, y = position
+        pygame.draw.rect(
+            self.screen,
+            color,
+            (x * TILE_SIZE + 2, y * TILE_SIZE + 2, TILE_SIZE - 4, TILE_SIZE - 4),
+            2
+        )
+
+    def highlights(self) -> Dict[Tuple[int, int], str]:
+        """Action type highlighted on each tile for the selected unit."""
+        engine = self.game_engine
+        if not engine.selected_unit:
+            return {}
+        highlighted = {}
+        for action_type, positions in (('move', engine.valid_moves), ('attack', engine.valid_attacks),
+                                       ('heal', engine.valid_heals)):
+            for position in positions:
+                highlighted[position] = action_type
+        return highlighted
+
+    def draw_valid_actions(self):
+        """Draw valid moves, attacks, and heals."""
+        for position, action_type in self.highlights().items():
+            self.draw_highlight(position, HIGHLIGHT_COLORS[action_type])
+
+    def status_text(self) -> str:
+        """The line describing whose turn it is or who won."""
+        if self.game_engine.state == GameState.PLACEMENT_PHASE:
+            return f"Player {self.game_engine.current_player}'s Turn - Place Units"
+        elif self.game_engine.state in [GameState.PLAYER_1_TURN, GameState.PLAYER_2_TURN]:
+            return f"Player {self.game_engine.current_player}'s Turn"
+        elif self.game_engine.state == GameState.GAME_OVER:
+            return f"Game Over - Player {self.game_engine.winner} Wins!"
+        return ""
+
+    def draw_status(self, text: str):
+        """Draw the status line."""
+        self.font.render_to(self.screen, STATUS_POSITION, text, (0, 0, 0))
+
+    def draw_game_state(self):
+        """Draw the current game state."""
+        # Draw grid
+        self.draw_grid()
+        
+        # Draw units
+        for unit in self.game_engine.get_all_units():
+            if unit.alive:
+                self.draw_unit(unit)
+                
+        # Draw valid actions
+        self.draw_valid_actions()
+        
+        # Draw game state text
+        self.draw_status(self.status_text())
+        self.rendered = self.frame_state()
+
+    def frame_state(self) -> Tuple[Dict[Tuple[int, int], TileState], str]:
+        """Everything drawn on screen: the non-blank tiles and the status text."""
+        highlighted = self.highlights()
+        tiles: Dict[Tuple[int, int], TileState] = {}
+        for position, unit in self.game_engine.units.items():
+            if unit.alive:
+                tiles[position] = (unit.get_symbol(), unit.player, unit.hp, unit.max_hp, highlighted.get(position))
+        for position, action_type in highlighted.items():
+            if position not in tiles:
+                tiles[position] = (None, 0, 0, 0, action_type)
+        return tiles, self.status_text()
+
+    def draw_tile(self, position: Tuple[int, int], action_type: Optional[str] = None):
+        """Repaint a single tile exactly as draw_game_state() would, minus the status text."""
+        x, y = position
+        unit = self.game_engine.units.get(position)
+        if unit and unit.alive:
+            self.draw_unit(unit)
+        else:
+            rect = (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+            self.screen.blit(self.background, rect, rect)
+        if action_type:
+            self.draw_highlight(position, HIGHLIGHT_COLORS[action_type])
+
+    def status_tiles(self, text: str) -> Set[Tuple[int, int]]:
+        """Tiles the status text overlaps."""
+        if not text:
+            return set()
+        if text in self.status_tile_cache:
+            return self.status_tile_cache[text]
+        rect = self.font.get_rect(text)
+        rect.topleft = STATUS_POSITION
+        rect.inflate_ip(4, 4)
+        tiles = {(x, y)
+                 for x in range(max(rect.left // TILE_SIZE, 0), min((rect.right - 1) // TILE_SIZE, BOARD_SIZE - 1) + 1)
+                 for y in range(max(rect.top // TILE_SIZE, 0), min((rect.bottom - 1) // TILE_SIZE, BOARD_SIZE - 1) + 1)}
+        # Only a handful of different status lines exist
+        self.status_tile_cache[text] = tiles
+        return tiles
+
+    def draw_changes(self) -> List[pygame.Rect]:
+        """Repaint the tiles that changed since the last frame and return their rectangles."""
+        tiles, text = self.frame_state()
+        old_tiles, old_text = self.rendered
+        dirty = {position for position in tiles.keys() | old_tiles.keys()
+                 if tiles.get(position) != old_tiles.get(position)}
+        # The status text sits on top of the bottom row, so it is redrawn along
+        # with every tile it covers whenever any of them changes
+        under_text = self.status_tiles(old_text) | self.status_tiles(text)
+        redraw_text = text != old_text or bool(dirty & under_text)
+        if redraw_text:
+            dirty |= under_text
+        for position in dirty:
+            state = tiles.get(position)
+            self.draw_tile(position, state[4] if state else None)
+        if redraw_text:
+            self.draw_status(text)
+        self.rendered = (tiles, text)
+        return [pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE) for x, y in dirty]
+
+    def handle_click(self, pos: Tuple[int, int]):
+        """Handle mouse click events."""
+        x, y = pos
+        board_x = x // TILE_SIZE
+        board_y = y // TILE_SIZE
+        
+        if not (0 <= board_x < BOARD_SIZE and 0 <= board_y < BOARD_SIZE):
+            return
+            
+        position = (board_x, board_y)
+        
+        if self.game_engine.state == GameState.PLACEMENT_PHASE:
+            # Get the current player's units
+            player_units = [u for u in self.game_engine.get_all_units() if u.player == self.game_engine.current_player]
+            
+            # Determine which unit to place based on count
+            unit_type = None
+            if len(player_units) == 0:
+                unit_type = UnitType.SOLDIER
+            elif len(player_units) == 1:
+                unit_type = UnitType.KNIGHT
+            elif len(player_units) == 2:
+                unit_type = UnitType.HEALER
+            elif len(player_units) == 3:
+                unit_type = UnitType.WALL
+            elif len(player_units) == 4:
+                unit_type = UnitType.CROWN
+            else:
+                # All units placed, start the game
+                self.game_engine.start_game()
+                return
+                
+            # Place the unit
+            if self.game_engine.place_unit(unit_type, position, self.game_engine.current_player):
+                # Switch player after successful placement
+                self.game_engine.current_player = 3 - self.game_engine.current_player
+                
+        elif self.game_engine.state in [GameState.PLAYER_1_TURN, GameState.PLAYER_2_TURN]:
+            # Handle unit selection and actions
+            if not self.game_engine.selected_unit:
+                self.game_engine.select_unit(position)
+            else:
+                # Try to perform an action
+                if position in self.game_engine.valid_moves:
+                    self.game_engine.move_unit(position)
+                elif position in self.game_engine.valid_attacks:
+                    self.game_engine.attack_unit(position)
+                elif position in self.game_engine.valid_heals:
+                    self.game_engine.heal_unit(position)
+                else:
+                    # Deselect unit if clicking elsewhere
+                    self.game_engine.selected_unit = None
+                    self.game_engine.valid_moves = []
+                    self.game_engine.valid_attacks = []
+                    self.game_engine.valid_heals = []
+
+    def run(self):
+        """Main game loop."""
+        if self.event_driven:
+            self.run_event_driven()
+            return
+        while self.running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.button == 1:  # Left click
+                        self.handle_click(event.pos)
+                        
+            # Draw everything
+            self.draw_game_state()
+            pygame.display.flip()
+            
+        pygame.quit()
+
+    def run_event_driven(self):
+        """Main loop that sleeps until input arrives and only repaints what changed."""
+        clock = pygame.time.Clock()
+        # Pointer motion never changes the picture, so it should not wake the loop
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
+        self.draw_game_state()
+        pygame.display.flip()
+        while self.running:
+            # Block until something happens, then take whatever else is queued
+            events = [pygame.event.wait()] + pygame.event.get()
+            repaint = False
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.running = False
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.button == 1:  # Left click
+                        self.handle_click(event.pos)
+                elif event.type in EXPOSE_EVENTS:
+                    repaint = True
+            if not self.running:
+                break
+
+            if repaint:
+                self.draw_game_state()
+                pygame.display.flip()
+            else:
+                dirty = self.draw_changes()
+                if dirty:
+                    pygame.display.update(dirty)
+            clock.tick(self.max_fps)
+
+        pygame.quit()
@@ -0,0 +1,185 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Engine methods timed by default
+ENGINE_METHODS = ('select_unit', 'update_valid_actions', 'move_unit', 'attack_unit', 'heal_unit',
+                  'end_turn', 'check_game_over')
+# Setting this to a file path turns instrumentation on for a whole run (see enable_from_environment)
+TRACE_ENV_VAR = 'GRID_CONQUERER_TRACE'
+# Histogram buckets are powers of two microseconds: bucket b holds calls under 2**b us
+NUM_BUCKETS = 24
+
+Target = Tuple[type, str]
+
+def default_targets() -> List[Target]:
+    """The engine's turn methods plus the decision of every built-in agent."""
+    from .game_engine import GameEngine
+    from .agents import RLAgent
+    from .search import AlphaBetaAgent
+    from .mcts import MCTSAgent
+    agents = (AlphaBetaAgent, MCTSAgent, RLAgent)
+    return [(GameEngine, name) for name in ENGINE_METHODS] + [(agent, 'choose_action') for agent in agents]
+
+class CallStats:
+    """Call count, total and maximum time and a log2 histogram for one method."""
+    __slots__ = ('count', 'total', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.buckets = [0] * NUM_BUCKETS
+
+    def record(self, microseconds: float) -> None:
+        self.count += 1
+        self.total += microseconds
+        if microseconds > self.maximum:
+            self.maximum = microseconds
+        self.buckets[min(int(microseconds).bit_length(), NUM_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound, in microseconds, of the bucket holding the given fraction of calls."""
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= wanted:
+                return float(1 << bucket)
+        return self.maximum
+
+class Instrumentation:
+    """
+    Opt-in call counting and timing of engine and agent hot paths.
+    enable() replaces each target method on its class with a timing wrapper
+    and disable() restores the original, so nothing is paid while it is off.
+    Calls are kept as histograms and, up to max_events, as trace events.
+    """
+    def __init__(self, targets: Optional[Sequence[Target]] = None, trace: bool = True, max_events: int = 1 << 20):
+        self.targets = list(targets) if targets is not None else default_targets()
+        self.trace = trace
+        self.max_events = max_events
+        self.stats: Dict[str, CallStats] = {}
+        self.events: List[Tuple[str, int, int, int]] = []  # (label, start ns, duration ns, thread id)
+        self.dropped_events = 0
+        self.origin = time.perf_counter_ns()
+        self._originals: Dict[Target, Optional[object]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self) -> None:
+        """Wrap every target method; calling it twice is harmless."""
+        for cls, name in self.targets:
+            if (cls, name) in self._originals:
+                continue
+            # None marks a method the class inherits, which disable() just deletes again
+            self._originals[(cls, name)] = cls.__dict__.get(name)
+            setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", getattr(cls, name)))
+
+    def disable(self) -> None:
+        """Put the original methods back; collected data is kept."""
+        for (cls, name), original in self._originals.items():
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._originals.clear()
+
+    def reset(self) -> None:
+        self.stats.clear()
+        self.events.clear()
+        self.dropped_events = 0
+        self.origin = time.perf_counter_ns()
+
+    def _wrap(self, label: str, original):
+        stats = self.stats.setdefault(label, CallStats())
+        events = self.events
+        clock = time.perf_counter_ns
+        get_ident = threading.get_ident
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                duration = clock() - start
+                stats.record(duration / 1000)
+                if self.trace:
+                    if len(events) < self.max_events:
+                        events.append((label, start, duration, get_ident()))
+                    else:
+                        self.dropped_events += 1
+        return timed
+
+    def summary(self, histograms: bool = True) -> str:
+        """Per-method table of calls and latency, busiest first, optionally with histograms."""
+        lines = [f"{'Method':<36}{'Calls':>9}{'Total ms':>11}{'Mean us':>10}{'p50 us':>9}{'p99 us':>9}{'Max us':>10}"]
+        ranked = sorted(((label, stats) for label, stats in self.stats.items() if stats.count),
+                        key=lambda item: -item[1].total)
+        for label, stats in ranked:
+            lines.append(f"{label:<36}{stats.count:>9}{stats.total / 1000:>11.2f}{stats.total / stats.count:>10.2f}"
+                         f"{stats.percentile(0.5):>9.0f}{stats.percentile(0.99):>9.0f}{stats.maximum:>10.1f}")
+        if histograms:
+            for label, stats in ranked:
+                lines.append('')
+                lines.append(label)
+                peak = max(stats.buckets)
+                for bucket, count in enumerate(stats.buckets):
+                    if count:
+                        bar = '#' * max(1, round(40 * count / peak))
+                        lines.append(f"  < {1 << bucket:>8} us {count:>9} {bar}")
+        if self.dropped_events:
+            lines.append(f"({self.dropped_events} trace events dropped after the first {self.max_events})")
+        return '\n'.join(lines)
+
+    def chrome_trace(self) -> dict:
+        """The recorded calls in Chrome trace-event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        return {
+            'displayTimeUnit': 'ms',
+            'traceEvents': [
+                {'name': label, 'cat': label.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': thread,
+                 'ts': (start - self.origin) / 1000, 'dur': duration / 1000}
+                for label, start, duration, thread in self.events
+            ],
+        }
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, 'w') as trace_file:
+            json.dump(self.chrome_trace(), trace_file)
+
+    def __enter__(self) -> 'Instrumentation':
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+def enable_from_environment() -> Optional[Instrumentation]:
+    """Turn instrumentation on when GRID_CONQUERER_TRACE names a trace file.
+
+    The trace is written and the summary printed to stderr at exit. Returns
+    None, having done nothing, when the variable is unset.
+    """
+    path = os.environ.get(TRACE_ENV_VAR)
+    if not path:
+        return None
+    instrumentation = Instrumentation()
+    instrumentation.enable()
+
+    def finish() -> None:
+        instrumentation.disable()
+        instrumentation.write_chrome_trace(path)
+        print(instrumentation.summary(), file=sys.stderr)
+        print(f"Trace written to {path}", file=sys.stderr)
+
+    atexit.register(finish)
+    return instrumentation
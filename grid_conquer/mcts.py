@@ -0,0 +1,250 @@
+import math
+import random
+import threading
+import time
+from typing import Callable, List, Optional
+from .constants import GameState
+from .game_engine import GameEngine, Action
+from .search import MoveKey, evaluate, move_key
+
+# Rollout policies take (engine, legal actions, rng) and return one of the actions
+RolloutPolicy = Callable[[GameEngine, List[Action], random.Random], Action]
+
+EVAL_SCALE = 400.0  # evaluation points per logistic unit when a rollout is cut off
+
+def random_rollout_policy(engine: GameEngine, actions: List[Action], rng: random.Random) -> Action:
+    """Play a uniformly random action."""
+    return rng.choice(actions)
+
+def attack_first_rollout_policy(engine: GameEngine, actions: List[Action], rng: random.Random) -> Action:
+    """Play a random attack if there is one, otherwise a random action."""
+    attacks = [action for action in actions if action[1] == 'attack']
+    return rng.choice(attacks or actions)
+
+class MCTSNode:
+    """One position in the search tree, reached by playing `action` from the parent."""
+    __slots__ = ('parent', 'action', 'player', 'position_hash', 'children', 'untried', 'visits', 'value')
+
+    def __init__(self, parent: Optional['MCTSNode'], action: Optional[MoveKey], player: int, position_hash: int):
+        self.parent = parent
+        self.action = action
+        self.player = player                # player who made `action`
+        self.position_hash = position_hash  # Zobrist hash after `action`
+        self.children: List['MCTSNode'] = []
+        self.untried: Optional[List[MoveKey]] = None  # filled on first visit
+        self.visits = 0
+        self.value = 0.0                    # total reward for `player`
+
+    def best_child(self, exploration: float) -> 'MCTSNode':
+        """Pick the child with the highest UCT score."""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.value / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+class MCTSAgent:
+    """
+    Monte Carlo Tree Search over GameEngine using UCT selection.
+    Each expanded leaf is scored by `rollouts_per_leaf` rollouts, which are capped
+    and finished with the static evaluation. With a `batch_rollout_policy` (see
+    batch_engine.py) a leaf's rollouts are played together in a BatchGameEngine,
+    which pays off from a few dozen rollouts per leaf; otherwise they are played
+    one by one on the engine with `rollout_policy`. The subtree for the position
+    actually reached is kept between turns. Setting `stop_event` from another
+    thread ends a running search after the current iteration.
+    """
+    def __init__(self, game_engine: GameEngine, time_limit: Optional[float] = 1.0,
+                 iterations: Optional[int] = None, rollouts_per_leaf: int = 2,
+                 rollout_depth: int = 10, exploration: float = 1.4,
+                 rollout_policy: RolloutPolicy = attack_first_rollout_policy,
+                 batch_rollout_policy: Optional[Callable] = None, seed: Optional[int] = None):
+        self.game_engine = game_engine
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.rollouts_per_leaf = rollouts_per_leaf
+        self.rollout_depth = rollout_depth
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy
+        self.batch_rollout_policy = batch_rollout_policy
+        self.rng = random.Random(seed)
+        self.batch_rng = None  # NumPy generator, created (from rng) on the first batched evaluation
+        self.root: Optional[MCTSNode] = None
+        self.stop_event: Optional[threading.Event] = None
+        # Statistics from the last choose_action() call
+        self.last_iterations = 0
+        self.last_rollouts = 0
+        self.last_elapsed = 0.0
+        self.last_reused = 0
+
+    @property
+    def rollouts_per_second(self) -> float:
+        """Playout throughput of the last choose_action() call."""
+        return self.last_rollouts / self.last_elapsed if self.last_elapsed > 0 else 0.0
+
+    def report(self) -> str:
+        """Summarise the last search."""
+        return (f"{self.last_iterations} iterations, {self.last_rollouts} rollouts in {self.last_elapsed:.2f}s "
+                f"({self.rollouts_per_second:.0f} rollouts/s), {self.last_reused} visits reused")
+
+    def choose_action(self) -> Optional[Action]:
+        """Grow the tree within the budget and return the most visited action."""
+        engine = self.game_engine
+        start = time.perf_counter()
+        actions = engine.legal_actions()
+        if len(actions) <= 1:
+            self.root = None
+            return actions[0] if actions else None
+
+        root = self._reuse_root()
+        self.last_reused = root.visits
+        deadline = start + self.time_limit if self.time_limit is not None else None
+        iterations = 0
+        self.last_rollouts = 0
+        while True:
+            if self.iterations is not None and iterations >= self.iterations:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            if self.stop_event is not None and self.stop_event.is_set():
+                break
+            self._iterate(root)
+            iterations += 1
+            if self.iterations is None and deadline is None:
+                break
+
+        self.root = root
+        self.last_iterations = iterations
+        self.last_elapsed = time.perf_counter() - start
+        if not root.children:
+            return actions[0]
+        origin, action_type, target = max(root.children, key=lambda child: child.visits).action
+        return (engine.units[origin], action_type, target)
+
+    def _reuse_root(self) -> MCTSNode:
+        """Find the current position among the previous root's children or grandchildren."""
+        engine = self.game_engine
+        position_hash = engine.zobrist_hash
+        previous = self.root
+        if previous is not None:
+            candidates = [previous] + previous.children
+            for node in list(previous.children):
+                candidates.extend(node.children)
+            for node in candidates:
+                if node.position_hash == position_hash:
+                    node.parent = None
+                    node.action = None
+                    return node
+        return MCTSNode(None, None, 3 - engine.current_player, position_hash)
+
+    def _iterate(self, root: MCTSNode) -> None:
+        """Run one select / expand / evaluate / backpropagate cycle."""
+        engine = self.game_engine
+        node = root
+        depth = 0
+
+        # Selection: descend through fully expanded nodes
+        while True:
+            if node.untried is None:
+                node.untried = [move_key(action) for action in engine.legal_actions()]
+                self.rng.shuffle(node.untried)
+            if node.untried or not node.children or engine.state == GameState.GAME_OVER:
+                break
+            node = node.best_child(self.exploration)
+            self._apply(node.action)
+            depth += 1
+
+        # Expansion: add one untried child
+        if node.untried and engine.state != GameState.GAME_OVER:
+            key = node.untried.pop()
+            player = engine.current_player
+            self._apply(key)
+            depth += 1
+            child = MCTSNode(node, key, player, engine.zobrist_hash)
+            node.children.append(child)
+            node = child
+
+        # Evaluation: rollouts from the leaf, scored for the player who just moved
+        reward = self.evaluate_leaf(node.player, self.rollouts_per_leaf)
+        for _ in range(depth):
+            engine.undo_action()
+
+        # Backpropagation: each node is credited from the view of the player who moved into it
+        leaf_player = node.player
+        while node is not None:
+            node.visits += 1
+            node.value += reward if node.player == leaf_player else 1.0 - reward
+            node = node.parent
+
+    def evaluate_leaf(self, player: int, rollouts: int) -> float:
+        """Average the result of several rollouts from the current position for `player`."""
+        if self.batch_rollout_policy is not None:
+            total = self._batch_rollouts(player, rollouts)
+        else:
+            total = 0.0
+            for _ in range(rollouts):
+                total += self._rollout(player)
+        self.last_rollouts += rollouts
+        return total / rollouts
+
+    def _batch_rollouts(self, player: int, rollouts: int) -> float:
+        """Play `rollouts` rollouts from the current position in lockstep; return their summed score for `player`."""
+        # NumPy is only needed here, so agents that never batch do not pay for importing it
+        import numpy as np
+        from .batch_engine import BatchGameEngine
+        engine = self.game_engine
+        if engine.state == GameState.GAME_OVER:
+            return rollouts * (1.0 if engine.winner == player else 0.0)
+        if self.batch_rng is None:
+            self.batch_rng = np.random.default_rng(self.rng.getrandbits(64))
+
+        batch = BatchGameEngine.from_units(engine.get_all_units(), rollouts, engine.current_player)
+        total = 0.0
+        for _ in range(self.rollout_depth):
+            mask = batch.legal_mask()
+            stuck = ~mask.any(axis=1)
+            if stuck.any():
+                # Like _rollout, a game with no legal action stops and is scored as it stands
+                total += self._cutoff_scores(batch.subset(np.flatnonzero(stuck)), player).sum()
+                playing = np.flatnonzero(~stuck)
+                if not len(playing):
+                    return total
+                batch, mask = batch.subset(playing), mask[playing]
+            _, dones, winners, _ = batch.step(self.batch_rollout_policy(mask, self.batch_rng))
+            if dones.any():
+                total += np.count_nonzero(winners[dones] == player)
+                playing = np.flatnonzero(~dones)
+                if not len(playing):
+                    return total
+                batch = batch.subset(playing)
+        # Rollout cap reached: fall back to the static evaluation
+        return total + self._cutoff_scores(batch, player).sum()
+
+    @staticmethod
+    def _cutoff_scores(batch, player: int):
+        """The static evaluation of every game in a BatchGameEngine, squashed to [0, 1] like _rollout's."""
+        import numpy as np
+        return 1.0 / (1.0 + np.exp(-batch.evaluate(player) / EVAL_SCALE))
+
+    def _rollout(self, player: int) -> float:
+        """Play out from the current position and score the result for `player` in [0, 1]."""
+        engine = self.game_engine
+        depth = 0
+        while engine.state != GameState.GAME_OVER and depth < self.rollout_depth:
+            actions = engine.legal_actions()
+            if not actions:
+                break
+            engine.apply_action(self.rollout_policy(engine, actions, self.rng))
+            depth += 1
+
+        if engine.state == GameState.GAME_OVER:
+            result = 1.0 if engine.winner == player else 0.0
+        else:
+            # Rollout cap reached: fall back to the static evaluation
+            result = 1.0 / (1.0 + math.exp(-evaluate(engine, player) / EVAL_SCALE))
+        for _ in range(depth):
+            engine.undo_action()
+        return result
+
+    def _apply(self, key: MoveKey) -> None:
+        """Apply an action stored in the tree to the engine."""
+        origin, action_type, target = key
+        self.game_engine.apply_action((self.game_engine.units[origin], action_type, target))
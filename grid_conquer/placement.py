@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .constants import BOARD_SIZE, UnitType, UNIT_STATS, DEFAULT_LAYOUT, PLACEMENT_ORDER
+from .batch_engine import BatchGameEngine
+from .action_space import NUM_ACTIONS, NUM_KINDS, NUM_SQUARES, KIND_INDEX
+from .symmetry import mirror_square
+
+PLACEMENT_ROWS = {1: range(0, 3), 2: range(BOARD_SIZE - 3, BOARD_SIZE)}  # as in is_valid_placement
+BOOK_VERSION = 1
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.json')
+
+# A layout is the squares (y * BOARD_SIZE + x) of one player's units in PLACEMENT_ORDER
+Squares = Tuple[int, ...]
+
+def zone_squares(player: int) -> List[int]:
+    """All squares a player may place on."""
+    return [y * BOARD_SIZE + x for y in PLACEMENT_ROWS[player] for x in range(BOARD_SIZE)]
+
+def mirror_squares(squares: Squares) -> Squares:
+    """Reflect every square of a layout left to right."""
+    return tuple(mirror_square(square) for square in squares)
+
+def canonical(squares: Squares) -> Tuple[Squares, bool]:
+    """The smaller of a layout (or layout prefix) and its mirror image, and whether it was mirrored."""
+    mirrored = mirror_squares(squares)
+    return (mirrored, True) if mirrored < squares else (squares, False)
+
+def layout_squares(layout, player: int) -> Squares:
+    """Squares of one player's units from a (unit type, (x, y), player) layout, in PLACEMENT_ORDER."""
+    by_type = {unit_type: y * BOARD_SIZE + x for unit_type, (x, y), owner in layout if owner == player}
+    return tuple(by_type[unit_type] for unit_type in PLACEMENT_ORDER)
+
+def placed_squares(engine, player: int) -> Squares:
+    """Squares of the units a player has placed so far, in PLACEMENT_ORDER."""
+    by_type = {unit.unit_type: unit.position[1] * BOARD_SIZE + unit.position[0]
+               for unit in engine.units.values() if unit.player == player}
+    squares = []
+    for unit_type in PLACEMENT_ORDER:
+        if unit_type not in by_type:
+            break
+        squares.append(by_type[unit_type])
+    return tuple(squares)
+
+def sample_layouts(player: int, count: int, rng: np.random.Generator,
+                   include: Sequence[Squares] = ()) -> List[Squares]:
+    """Distinct random layouts for a player, one per mirror pair, in canonical orientation."""
+    zone = np.array(zone_squares(player))
+    seen = {canonical(squares)[0] for squares in include}
+    layouts = list(seen)
+    # A fixed cap on attempts keeps tiny requests from spinning once the zone is exhausted
+    for _ in range(count * 20):
+        if len(layouts) >= count:
+            break
+        squares = canonical(tuple(int(s) for s in rng.choice(zone, len(PLACEMENT_ORDER), replace=False)))[0]
+        if squares not in seen:
+            seen.add(squares)
+            layouts.append(squares)
+    return layouts[:count]
+
+def _planes(layouts: Sequence[Squares], player: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Type, owner and HP planes, shape (len(layouts), 64), for one player's layouts."""
+    types = np.zeros((len(layouts), NUM_SQUARES), dtype=np.int8)
+    hp = np.zeros((len(layouts), NUM_SQUARES), dtype=np.int16)
+    for row, squares in enumerate(layouts):
+        for unit_type, square in zip(PLACEMENT_ORDER, squares):
+            types[row, square] = unit_type.value
+            hp[row, square] = UNIT_STATS[unit_type]['hp']
+    return types, np.where(types > 0, player, 0).astype(np.int8), hp
+
+def playout_scores(first: Sequence[Squares], second: Sequence[Squares], playouts: int,
+                   rng: np.random.Generator, max_plies: int = 200, batch_size: int = 4096) -> np.ndarray:
+    """Player 2's mean score (win 1, draw 0.5) for every pair of layouts, from batched random playouts.
+
+    Playouts pick uniformly among legal attacks when there are any, otherwise
+    among all legal actions, the same bias as MCTS's default rollout policy.
+    """
+    types1, owners1, hp1 = _planes(first, 1)
+    types2, owners2, hp2 = _planes(second, 2)
+    # One row per (first, second, playout), flattened in that order
+    pairs = np.arange(len(first) * len(second) * playouts) // playouts
+    rows1, rows2 = np.divmod(pairs, len(second))
+    attack_bonus = np.zeros(NUM_ACTIONS, dtype=np.float32)
+    attack_bonus[KIND_INDEX['attack']::NUM_KINDS] = 1.0
+
+    scores = np.zeros(len(pairs), dtype=np.float32)
+    for start in range(0, len(pairs), batch_size):
+        r1, r2 = rows1[start:start + batch_size], rows2[start:start + batch_size]
+        batch = BatchGameEngine(len(r1), max_plies=max_plies)
+        batch.load_layouts(types1[r1] + types2[r2], owners1[r1] + owners2[r2], hp1[r1] + hp2[r2])
+        result = np.full(len(r1), -1, dtype=np.int8)
+        running = np.arange(len(r1))  # batch slot -> playout, for the games still being played
+        while len(running):
+            mask = batch.legal_mask()
+            priority = rng.random(mask.shape, dtype=np.float32) + attack_bonus
+            priority[~mask] = -1.0
+            # A game with no legal action gets index 0, which step() treats as a pass
+            _, dones, winners, _ = batch.step(np.argmax(priority, axis=1))
+            result[running[dones]] = winners[dones]
+            if dones.any():
+                # Drop finished games so the long tail of slow games runs on a small batch
+                batch = batch.subset(np.flatnonzero(~dones))
+                running = running[~dones]
+        scores[start:start + len(r1)] = np.where(result == 2, 1.0, np.where(result == 0, 0.5, 0.0))
+    return scores.reshape(len(first), len(second), playouts).mean(axis=2)
+
+def build_book(first_count: int = 64, second_count: int = 64, playouts: int = 8, top: int = 16,
+               seed: int = 0, max_plies: int = 200) -> dict:
+    """Score sampled layouts against each other and build player 2's opening book.
+
+    Only canonical player 1 layouts are played out; their mirror images are
+    scored by symmetry. Player 2 candidates are kept in both orientations.
+    """
+    rng = np.random.default_rng(seed)
+    first = sample_layouts(1, first_count, rng, include=[layout_squares(DEFAULT_LAYOUT, 1)])
+    second_canonical = sample_layouts(2, second_count, rng, include=[layout_squares(DEFAULT_LAYOUT, 2)])
+    second = sorted(set(second_canonical) | {mirror_squares(squares) for squares in second_canonical})
+    second_index = {squares: index for index, squares in enumerate(second)}
+    mirror_of = np.array([second_index[mirror_squares(squares)] for squares in second])
+
+    scores = playout_scores(first, second, playouts, rng, max_plies)
+
+    # Mirroring both sides of a pairing leaves its score unchanged, so a mirrored
+    # player 1 layout scores like the original against mirrored replies
+    rows: Dict[Squares, np.ndarray] = {}
+    for squares, row in zip(first, scores):
+        rows[squares] = row
+        rows[mirror_squares(squares)] = row[mirror_of]
+
+    # Average over every player 1 layout that starts with each prefix; only
+    # canonical prefixes are stored and lookups mirror the rest
+    totals: Dict[Squares, np.ndarray] = {}
+    counts: Dict[Squares, int] = {}
+    for squares, row in rows.items():
+        for length in range(len(PLACEMENT_ORDER) + 1):
+            prefix = squares[:length]
+            if canonical(prefix)[1]:
+                continue
+            totals[prefix] = totals.get(prefix, 0) + row
+            counts[prefix] = counts.get(prefix, 0) + 1
+
+    replies = {}
+    for prefix, total in totals.items():
+        ranked = np.argsort(-total / counts[prefix], kind='stable')[:top]
+        replies[','.join(map(str, prefix))] = [int(index) for index in ranked]
+    return {
+        'version': BOOK_VERSION,
+        'playouts': playouts,
+        'layouts': [list(squares) for squares in second],
+        'replies': replies,
+    }
+
+class OpeningBook:
+    """
+    Precomputed placements for player 2, keyed by what player 1 has placed.
+    Each canonical player 1 prefix maps to player 2 layouts ranked by playout
+    score, so a lookup is a dict access plus a scan of a short list.
+    """
+    def __init__(self, book: dict):
+        if book.get('version') != BOOK_VERSION:
+            raise ValueError(f"Unsupported opening book version {book.get('version')}")
+        self.layouts: List[Squares] = [tuple(squares) for squares in book['layouts']]
+        self.replies: Dict[Squares, List[int]] = {
+            tuple(int(s) for s in key.split(',') if s): ranked for key, ranked in book['replies'].items()
+        }
+
+    @classmethod
+    def empty(cls) -> 'OpeningBook':
+        """A book with no entries; every placement falls back to the first free square."""
+        return cls({'version': BOOK_VERSION, 'layouts': [], 'replies': {}})
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_BOOK_PATH) -> 'OpeningBook':
+        with open(path) as book_file:
+            return cls(json.load(book_file))
+
+    def reply(self, first: Squares, placed: Squares = ()) -> Optional[Squares]:
+        """Best known player 2 layout against a player 1 layout (or prefix) that keeps `placed` as is."""
+        for length in range(len(first), -1, -1):
+            prefix, mirrored = canonical(first[:length])
+            ranked = self.replies.get(prefix)
+            if ranked is None:
+                continue
+            for index in ranked:
+                squares = self.layouts[index]
+                if mirrored:
+                    squares = mirror_squares(squares)
+                if squares[:len(placed)] == placed:
+                    return squares
+            # Nothing consistent with what player 2 already placed; try a shorter prefix
+        return None
+
+    def next_placement(self, engine) -> Optional[Tuple[UnitType, Tuple[int, int]]]:
+        """The next (unit type, position) player 2 should place in this engine, or None when done."""
+        placed = placed_squares(engine, 2)
+        if len(placed) == len(PLACEMENT_ORDER):
+            return None
+        unit_type = PLACEMENT_ORDER[len(placed)]
+        squares = self.reply(placed_squares(engine, 1), placed)
+        if squares is not None:
+            square = squares[len(placed)]
+        else:
+            # Off-book: take the first free square in the zone
+            square = next(s for s in zone_squares(2) if (s % BOARD_SIZE, s // BOARD_SIZE) not in engine.units)
+        return unit_type, (square % BOARD_SIZE, square // BOARD_SIZE)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Search starting layouts and write player 2's opening book")
+    parser.add_argument('--first', type=int, default=64, help="player 1 layouts to sample (one per mirror pair)")
+    parser.add_argument('--second', type=int, default=64, help="player 2 layouts to sample (one per mirror pair)")
+    parser.add_argument('--playouts', type=int, default=8, help="random playouts per pair of layouts")
+    parser.add_argument('--top', type=int, default=16, help="replies kept per player 1 prefix")
+    parser.add_argument('--max-plies', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    book = build_book(args.first, args.second, args.playouts, args.top, args.seed, args.max_plies)
+    with open(args.out, 'w') as book_file:
+        json.dump(book, book_file, separators=(',', ':'))
+    print(f"{len(book['replies'])} prefixes, {len(book['layouts'])} layouts written to {args.out} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import mmap
+import os
+import struct
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from .constants import BOARD_SIZE, GameState, UnitType
+from .game_engine import GameEngine, Action
+
+# Data file layout: a file header, then one record per game:
+#   game header  <BBH   unit count, winner (0 = none or draw), action count
+#   units        <BB    unit type << 2 | player, square      (per unit)
+#   actions      <BBB   origin square, target square, kind   (per action)
+# Squares are y * BOARD_SIZE + x. The index file is a flat array of <Q byte
+# offsets, one per game, so any game can be found in O(1).
+MAGIC = b'GCRD'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sB')
+GAME_HEADER = struct.Struct('<BBH')
+UNIT_RECORD = struct.Struct('<BB')
+ACTION_RECORD = struct.Struct('<BBB')
+OFFSET_RECORD = struct.Struct('<Q')
+
+# Action kind codes; PASS records a turn ended without acting
+ACTION_CODES = {'move': 0, 'attack': 1, 'heal': 2}
+ACTION_NAMES = ('move', 'attack', 'heal')
+PASS = 3
+
+Layout = List[Tuple[UnitType, Tuple[int, int], int]]
+RecordedAction = Optional[Tuple[Tuple[int, int], str, Tuple[int, int]]]  # None is a pass
+
+class GameRecord(NamedTuple):
+    layout: Layout
+    actions: List[RecordedAction]
+    winner: Optional[int]
+
+def index_path(path: str) -> str:
+    """Path of the offset index that belongs to the data file at `path`."""
+    return path + '.idx'
+
+def encode_action(action: Optional[Action]) -> bytes:
+    """Pack one engine action (or None for a pass) into its 3-byte record."""
+    if action is None:
+        return ACTION_RECORD.pack(0, 0, PASS)
+    unit, action_type, (x, y) = action
+    ux, uy = unit.position
+    return ACTION_RECORD.pack(uy * BOARD_SIZE + ux, y * BOARD_SIZE + x, ACTION_CODES[action_type])
+
+def encode_game(layout: Layout, actions: Sequence[bytes], winner: Optional[int]) -> bytes:
+    """Pack a whole game; `actions` are records from encode_action()."""
+    parts = [GAME_HEADER.pack(len(layout), winner or 0, len(actions))]
+    for unit_type, (x, y), player in layout:
+        parts.append(UNIT_RECORD.pack(unit_type.value << 2 | player, y * BOARD_SIZE + x))
+    parts.extend(actions)
+    return b''.join(parts)
+
+class GameRecordWriter:
+    """
+    Appends finished games to a record file and its offset index.
+    Each game is written and flushed as a whole, data before index, so a
+    crash can at worst leave unindexed bytes that readers never see.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.data_file = open(path, 'ab')
+        self.index_file = open(index_path(path), 'ab')
+        if self.data_file.tell() == 0:
+            self.data_file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        # Games in the file so far, earlier runs included; the next game gets this index
+        self.games = self.index_file.tell() // OFFSET_RECORD.size
+        if self.index_file.tell() % OFFSET_RECORD.size:
+            # Drop a torn offset left by a crash so later offsets stay aligned
+            self.index_file.truncate(self.games * OFFSET_RECORD.size)
+
+    def write_game(self, layout: Layout, actions: Sequence[bytes], winner: Optional[int]) -> None:
+        """Append one game; `actions` are records from encode_action()."""
+        self.write_encoded(encode_game(layout, actions, winner))
+
+    def write_encoded(self, game: bytes) -> None:
+        """Append one game already packed by encode_game()."""
+        offset = self.data_file.tell()
+        self.data_file.write(game)
+        self.data_file.flush()
+        self.index_file.write(OFFSET_RECORD.pack(offset))
+        self.index_file.flush()
+        self.games += 1
+
+    def close(self) -> None:
+        self.data_file.close()
+        self.index_file.close()
+
+    def __enter__(self) -> 'GameRecordWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class GameRecordReader:
+    """
+    Memory-mapped random access to the games in a record file.
+    Nothing is decoded until a game is requested, so files far larger than
+    RAM can be iterated or sampled.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._files = [open(path, 'rb'), open(index_path(path), 'rb')]
+        self._data = self._map(self._files[0])
+        self._index = self._map(self._files[1])
+        # A torn trailing offset from a crashed writer is ignored; the game it
+        # belonged to is unindexed
+        self._games = len(self._index) // OFFSET_RECORD.size
+        if self._data[:FILE_HEADER.size] != FILE_HEADER.pack(MAGIC, VERSION):
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} game record file")
+
+    @staticmethod
+    def _map(file) -> memoryview:
+        # mmap cannot map empty files
+        if os.fstat(file.fileno()).st_size == 0:
+            return memoryview(b'')
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self._games
+
+    def __getitem__(self, game: int) -> GameRecord:
+        if game < 0:
+            game += self._games
+        if not 0 <= game < self._games:
+            raise IndexError(f"game {game} out of range for {self._games} games")
+        offset, = OFFSET_RECORD.unpack_from(self._index, game * OFFSET_RECORD.size)
+        data = self._data
+        unit_count, winner, action_count = GAME_HEADER.unpack_from(data, offset)
+        offset += GAME_HEADER.size
+
+        layout = []
+        for packed, square in UNIT_RECORD.iter_unpack(data[offset:offset + unit_count * UNIT_RECORD.size]):
+            layout.append((UnitType(packed >> 2), (square % BOARD_SIZE, square // BOARD_SIZE), packed & 3))
+        offset += unit_count * UNIT_RECORD.size
+
+        actions = []
+        for origin, target, kind in ACTION_RECORD.iter_unpack(data[offset:offset + action_count * ACTION_RECORD.size]):
+            if kind == PASS:
+                actions.append(None)
+            else:
+                actions.append(((origin % BOARD_SIZE, origin // BOARD_SIZE), ACTION_NAMES[kind],
+                                (target % BOARD_SIZE, target // BOARD_SIZE)))
+        return GameRecord(layout, actions, winner or None)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for game in range(len(self)):
+            yield self[game]
+
+    def close(self) -> None:
+        if self._files[0].closed:
+            return
+        # Views must be released before the maps under them can close
+        self._games = 0
+        for view in (self._index, self._data):
+            mapped = view.obj
+            view.release()
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for file in self._files:
+            file.close()
+
+    def __enter__(self) -> 'GameRecordReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def replay(record: GameRecord, ply: Optional[int] = None) -> GameEngine:
+    """Rebuild the engine state after the first `ply` actions (all of them by default)."""
+    engine = GameEngine()
+    if not engine.place_layout(record.layout):
+        raise ValueError("Recorded layout is not a legal placement")
+    actions = record.actions if ply is None else record.actions[:ply]
+    for number, action in enumerate(actions):
+        if engine.state == GameState.GAME_OVER:
+            raise ValueError(f"Recorded action {number} comes after the game ended")
+        if action is None:
+            engine.end_turn()
+            continue
+        origin, action_type, target = action
+        unit = engine.units.get(origin)
+        if unit is None or not engine.apply_action((unit, action_type, target)):
+            raise ValueError(f"Recorded action {number} cannot be applied: {action}")
+    return engine
@@ -0,0 +1,282 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from .constants import GameState, UnitType
+from .game_engine import GameEngine, Action, MoveKey, ATTACKING_TYPES
+from .symmetry import canonical_hash, mirror_move
+
+# Static evaluation weights
+UNIT_VALUES = {
+    UnitType.SOLDIER: 400,
+    UnitType.KNIGHT: 450,
+    UnitType.HEALER: 250,
+    UnitType.WALL: 100,
+    UnitType.CROWN: 0
+}
+HP_WEIGHT = 2           # per HP point of an ordinary unit
+CROWN_HP_WEIGHT = 6     # per HP point of a crown
+DISTANCE_PENALTY = 8    # per step between an attacker and the enemy crown
+
+WIN_SCORE = 1000000
+INFINITY = WIN_SCORE + 1
+MAX_PLY = 128
+# Longest win or loss a tablebase can report, in plies (tablebase.BIG)
+MAX_TABLEBASE_PLIES = 0x8000
+# Scores at or beyond this are forced results: the search reaches game ends within MAX_PLY
+# plies, and a tablebase probe adds up to MAX_TABLEBASE_PLIES more
+MATE_BOUND = WIN_SCORE - MAX_PLY - MAX_TABLEBASE_PLIES
+
+# Transposition table bound types
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+def evaluate(engine: GameEngine, player: int) -> int:
+    """Score a position from `player`'s point of view."""
+    crowns = {}
+    for unit in engine.units.values():
+        if unit.unit_type == UnitType.CROWN:
+            crowns[unit.player] = unit.position
+
+    score = 0
+    for unit in engine.units.values():
+        if unit.unit_type == UnitType.CROWN:
+            value = CROWN_HP_WEIGHT * unit.hp
+        else:
+            value = UNIT_VALUES[unit.unit_type] + HP_WEIGHT * unit.hp
+            if unit.unit_type in ATTACKING_TYPES:
+                crown = crowns.get(3 - unit.player)
+                if crown:
+                    dx = abs(unit.position[0] - crown[0])
+                    dy = abs(unit.position[1] - crown[1])
+                    # Soldiers walk orthogonally, knights diagonally
+                    distance = dx + dy if unit.unit_type == UnitType.SOLDIER else max(dx, dy)
+                    value -= DISTANCE_PENALTY * distance
+        score += value if unit.player == player else -value
+    return score
+
+def move_key(action: Action) -> MoveKey:
+    """Identify an action by squares so it survives apply/undo and transpositions."""
+    unit, action_type, target = action
+    return (unit.position, action_type, target)
+
+class AlphaBetaAgent:
+    """
+    Negamax alpha-beta search over GameEngine.legal_actions().
+    Uses iterative deepening within a wall-clock budget, a bounded transposition
+    table keyed by the Zobrist hash, and MVV-LVA / killer / history move ordering.
+    Positions covered by `tablebases` (a tablebase.TablebaseSet) are scored
+    exactly instead of searched. Setting `stop_event` from another thread ends
+    a running search early, like the time budget running out.
+    """
+    def __init__(self, game_engine: GameEngine, time_limit: float = 1.0,
+                 max_depth: int = 64, tt_size: int = 1 << 18, tablebases=None):
+        self.game_engine = game_engine
+        self.tablebases = tablebases
+        self.time_limit = time_limit
+        self.max_depth = min(max_depth, MAX_PLY - 1)
+        self.tt_size = tt_size
+        self.tt: Dict[int, Tuple[int, int, int, Optional[MoveKey]]] = {}  # hash -> (depth, score, bound, best move)
+        self.history: Dict[MoveKey, int] = {}
+        self.killers: List[List[Optional[MoveKey]]] = [[None, None] for _ in range(MAX_PLY)]
+        self.nodes = 0
+        self.deadline = 0.0
+        self.stop_event: Optional[threading.Event] = None
+        # Statistics from the last choose_action() call
+        self.last_depth = 0
+        self.last_nodes = 0
+        self.last_score = 0
+        self.last_elapsed = 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Search speed of the last choose_action() call."""
+        return self.last_nodes / self.last_elapsed if self.last_elapsed > 0 else 0.0
+
+    def report(self) -> str:
+        """Summarise the last search."""
+        return (f"depth {self.last_depth}, score {self.last_score}, "
+                f"{self.last_nodes} nodes in {self.last_elapsed:.2f}s ({self.nodes_per_second:.0f} nodes/s)")
+
+    def choose_action(self) -> Optional[Action]:
+        """Search the current position and return the best action found in the time budget."""
+        engine = self.game_engine
+        start = time.perf_counter()
+        self.deadline = start + self.time_limit
+        self.nodes = 0
+        self.last_depth = 0
+        self.last_score = 0
+        self.history.clear()
+        for killers in self.killers:
+            killers[0] = killers[1] = None
+
+        actions = engine.legal_actions()
+        best_action = actions[0] if actions else None
+        if len(actions) > 1:
+            base = len(engine.undo_stack)
+            for depth in range(1, self.max_depth + 1):
+                try:
+                    score, action = self._search_root(actions, depth)
+                except SearchTimeout:
+                    # Unwind whatever the interrupted iteration left applied
+                    while len(engine.undo_stack) > base:
+                        engine.undo_action()
+                    break
+                best_action = action
+                self.last_depth = depth
+                self.last_score = score
+                if abs(score) >= MATE_BOUND:
+                    break  # forced result found, deeper search won't change it
+
+        self.last_nodes = self.nodes
+        self.last_elapsed = time.perf_counter() - start
+        return best_action
+
+    def _search_root(self, actions: List[Action], depth: int) -> Tuple[int, Action]:
+        """Search every root action to `depth` and return the best one."""
+        engine = self.game_engine
+        key, mirrored = canonical_hash(engine)
+        entry = self.tt.get(key)
+        tt_move = entry[3] if entry else None
+        ordered = self._order_actions(actions, mirror_move(tt_move) if mirrored else tt_move, 0)
+        alpha = -INFINITY
+        best_action = ordered[0]
+        for action in ordered:
+            engine.apply_action(action)
+            score = -self._negamax(depth - 1, -INFINITY, -alpha, 1)
+            engine.undo_action()
+            if score > alpha:
+                alpha = score
+                best_action = action
+        best_key = move_key(best_action)
+        self._store(key, depth, alpha, EXACT, mirror_move(best_key) if mirrored else best_key)
+        return alpha, best_action
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """Score the current position for the side to move."""
+        self.nodes += 1
+        if not self.nodes & 1023 and (time.perf_counter() > self.deadline
+                                      or self.stop_event is not None and self.stop_event.is_set()):
+            raise SearchTimeout()
+
+        engine = self.game_engine
+        if engine.state == GameState.GAME_OVER:
+            return WIN_SCORE - ply if engine.winner == engine.current_player else ply - WIN_SCORE
+        if self.tablebases is not None and len(engine.units) <= self.tablebases.max_units:
+            result = self.tablebases.probe(engine)
+            if result is not None:
+                outcome, plies = result
+                return outcome * (WIN_SCORE - ply - plies)
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return evaluate(engine, engine.current_player)
+
+        # Mirror-image positions share one entry, stored in the canonical orientation
+        key, mirrored = canonical_hash(engine)
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry:
+            entry_depth, entry_score, bound, tt_move = entry
+            if mirrored:
+                tt_move = mirror_move(tt_move)
+            if entry_depth >= depth:
+                entry_score = self._score_from_tt(entry_score, ply)
+                if bound == EXACT:
+                    return entry_score
+                if bound == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if bound == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+
+        actions = engine.legal_actions()
+        if not actions:
+            # A side without any legal action passes, as in the tablebases; if neither side can act it is a draw
+            if not engine.legal_actions(3 - engine.current_player):
+                return 0
+            engine.apply_pass()
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            engine.undo_action()
+            return score
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_key = None
+        for action in self._order_actions(actions, tt_move, ply):
+            action_key = move_key(action)
+            engine.apply_action(action)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            engine.undo_action()
+            if score > best_score:
+                best_score = score
+                best_key = action_key
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if action[1] != 'attack':
+                    killers = self.killers[ply]
+                    if killers[0] != action_key:
+                        killers[1] = killers[0]
+                        killers[0] = action_key
+                    self.history[action_key] = self.history.get(action_key, 0) + depth * depth
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._store(key, depth, self._score_to_tt(best_score, ply), bound,
+                    mirror_move(best_key) if mirrored else best_key)
+        return best_score
+
+    def _order_actions(self, actions: List[Action], tt_move: Optional[MoveKey], ply: int) -> List[Action]:
+        """Sort actions best-first: TT move, MVV-LVA attacks, killers, then history."""
+        units = self.game_engine.units
+        killers = self.killers[ply]
+        history = self.history
+
+        def priority(action: Action) -> int:
+            unit, action_type, target = action
+            key = (unit.position, action_type, target)
+            if key == tt_move:
+                return 1 << 30
+            if action_type == 'attack':
+                victim = units[target]
+                victim_value = CROWN_HP_WEIGHT * 100 if victim.unit_type == UnitType.CROWN else UNIT_VALUES[victim.unit_type]
+                if victim.hp <= unit.get_attack_damage():
+                    victim_value *= 2  # the attack kills
+                return (1 << 28) + victim_value * 16 - UNIT_VALUES[unit.unit_type]
+            if key == killers[0]:
+                return (1 << 27) + 1
+            if key == killers[1]:
+                return 1 << 27
+            return history.get(key, 0)
+
+        return sorted(actions, key=priority, reverse=True)
+
+    def _store(self, key: int, depth: int, score: int, bound: int, best_move: Optional[MoveKey]) -> None:
+        """Store a result, evicting the oldest entry when the table is full."""
+        tt = self.tt
+        if key not in tt and len(tt) >= self.tt_size:
+            del tt[next(iter(tt))]
+        tt[key] = (depth, score, bound, best_move)
+
+    @staticmethod
+    def _score_to_tt(score: int, ply: int) -> int:
+        """Make win/loss scores relative to the stored node rather than the root."""
+        if score >= MATE_BOUND:
+            return score + ply
+        if score <= -MATE_BOUND:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_tt(score: int, ply: int) -> int:
+        """Convert a stored win/loss score back to distance from the root."""
+        if score >= MATE_BOUND:
+            return score - ply
+        if score <= -MATE_BOUND:
+            return score + ply
+        return score
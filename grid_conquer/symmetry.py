@@ -0,0 +1,59 @@
+from typing import Optional, Tuple
+from .constants import BOARD_SIZE
+from .game_engine import GameEngine, MoveKey, SNAPSHOT_HEADER, SNAPSHOT_UNIT
+
+# The board and every unit's move, attack and heal directions are symmetric
+# under reflecting x -> BOARD_SIZE - 1 - x, so a position and its mirror image
+# have the same value and mirrored best moves. The canonical orientation of a
+# position is whichever of the two has the smaller Zobrist hash.
+
+def mirror_position(position: Tuple[int, int]) -> Tuple[int, int]:
+    """Reflect a board position left to right."""
+    x, y = position
+    return BOARD_SIZE - 1 - x, y
+
+def mirror_square(square: int) -> int:
+    """Reflect a square index (y * BOARD_SIZE + x) left to right."""
+    y, x = divmod(square, BOARD_SIZE)
+    return y * BOARD_SIZE + BOARD_SIZE - 1 - x
+
+def mirror_move(move: Optional[MoveKey]) -> Optional[MoveKey]:
+    """Reflect an (origin, action type, target) move; None stays None."""
+    if move is None:
+        return None
+    (x, y), action_type, (tx, ty) = move
+    return (BOARD_SIZE - 1 - x, y), action_type, (BOARD_SIZE - 1 - tx, ty)
+
+def is_canonical(engine: GameEngine) -> bool:
+    """Whether the position is already in canonical orientation."""
+    return engine.zobrist_hash <= engine.mirrored_zobrist_hash
+
+def canonical_hash(engine: GameEngine) -> Tuple[int, bool]:
+    """The canonical hash of a position, and whether it is the mirror image's hash."""
+    key = engine.zobrist_hash
+    mirror_key = engine.mirrored_zobrist_hash
+    return (mirror_key, True) if mirror_key < key else (key, False)
+
+def mirror_snapshot(data: bytes) -> bytes:
+    """Reflect a GameEngine.to_bytes() snapshot without decoding it into units."""
+    records = []
+    for offset in range(SNAPSHOT_HEADER.size, len(data), SNAPSHOT_UNIT.size):
+        record = bytearray(data[offset:offset + SNAPSHOT_UNIT.size])
+        record[1] = mirror_square(record[1])
+        records.append(bytes(record))
+    # Keep the records in square order, as to_bytes() writes them
+    records.sort(key=lambda record: record[1])
+    return data[:SNAPSHOT_HEADER.size] + b''.join(records)
+
+def mirror_engine(engine: GameEngine) -> GameEngine:
+    """A new engine holding the mirror image of a position (without undo history)."""
+    return GameEngine.from_bytes(mirror_snapshot(engine.to_bytes()))
+
+def canonicalize(engine: GameEngine) -> Tuple[GameEngine, bool]:
+    """The position in canonical orientation and whether it had to be mirrored.
+
+    A canonical position is returned as is, not copied.
+    """
+    if is_canonical(engine):
+        return engine, False
+    return mirror_engine(engine), True
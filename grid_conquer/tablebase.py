@@ -0,0 +1,440 @@
+import argparse
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from .constants import BOARD_SIZE, GameState, UnitType, UNIT_STATS, MOVE_DIRECTIONS, ATTACK_DIRECTIONS, ALL_DIRECTIONS
+from .action_space import NUM_SQUARES
+from .batch_engine import NEIGHBOUR
+from .placement import zone_squares
+from .symmetry import mirror_square
+
+# Tablebase files hold every position of one signature (the unit types each
+# player has left). Crowns and walls never move and always stand in their
+# owner's placement zone, so a file is split into slices, one per placement of
+# those fixed units; inside a slice the state is the side to move, the square
+# of every soldier and knight and the hits each unit has taken. Only slices in
+# canonical mirror orientation are stored (see symmetry.py).
+#
+# File layout: header <4sBxxxI (magic, version, JSON length), the JSON header,
+# a <I directory with one slot number per fixed-unit placement (NO_SLICE when
+# not stored) and then the <H value codes of each stored slice.
+MAGIC = b'GCTB'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sBxxxI')
+NO_SLICE = 0xFFFFFFFF
+FILE_SUFFIX = '.gctb'
+
+# Value codes: 0 is a draw (or a state that cannot occur), 1 <= code < BIG is a
+# win for the side to move in `code` plies and code > BIG a loss in code - BIG plies
+BIG = 0x8000
+
+# Healers are left out: heals restore 30 HP, which makes every multiple of 10
+# reachable and multiplies the HP axes fivefold
+TABLE_TYPES = (UnitType.SOLDIER, UnitType.KNIGHT, UnitType.WALL, UnitType.CROWN)
+TYPE_LETTERS = {UnitType.SOLDIER: 'S', UnitType.KNIGHT: 'K', UnitType.WALL: 'W', UnitType.CROWN: 'C'}
+LETTER_TYPES = {letter: unit_type for unit_type, letter in TYPE_LETTERS.items()}
+MOBILE_TYPES = frozenset((UnitType.SOLDIER, UnitType.KNIGHT))
+ATTACKER_TYPES = MOBILE_TYPES
+
+# Every attack does the same damage, so HP is stored as hits taken
+HIT_DAMAGE = UNIT_STATS[UnitType.SOLDIER]['attack']
+assert all(UNIT_STATS[unit_type]['attack'] == HIT_DAMAGE for unit_type in ATTACKER_TYPES)
+HP_LEVELS = {unit_type: -(-UNIT_STATS[unit_type]['hp'] // HIT_DAMAGE) for unit_type in TABLE_TYPES}
+
+ZONE_INDEX = {player: {square: index for index, square in enumerate(zone_squares(player))} for player in (1, 2)}
+ZONE_SIZE = len(zone_squares(1))
+MIRROR = np.array([mirror_square(square) for square in range(NUM_SQUARES)])
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(ALL_DIRECTIONS)}
+
+Signature = Tuple[Tuple[UnitType, ...], Tuple[UnitType, ...]]
+
+def signature_name(signature: Signature) -> str:
+    """File name stem of a signature, e.g. 'SWC-KC'."""
+    return '-'.join(''.join(TYPE_LETTERS[unit_type] for unit_type in units) for units in signature)
+
+def parse_signature(name: str) -> Signature:
+    """Inverse of signature_name(); unit types are put in canonical order."""
+    first, second = name.upper().split('-')
+    return (tuple(sorted(LETTER_TYPES[letter] for letter in first)),
+            tuple(sorted(LETTER_TYPES[letter] for letter in second)))
+
+def is_live(units: Sequence[UnitType]) -> bool:
+    """Whether a player with these units has not lost: a crown and at least one attacker."""
+    return UnitType.CROWN in units and any(unit_type in ATTACKER_TYPES for unit_type in units)
+
+def signatures(max_units: int) -> List[Signature]:
+    """Every live signature with at most `max_units` units, smallest first."""
+    found = []
+    extras = (UnitType.SOLDIER, UnitType.KNIGHT, UnitType.WALL)
+    for total in range(4, max_units + 1):
+        for first_count in range(2, total - 1):
+            for first in itertools.combinations_with_replacement(extras, first_count - 1):
+                for second in itertools.combinations_with_replacement(extras, total - first_count - 1):
+                    signature = (tuple(sorted(first + (UnitType.CROWN,))), tuple(sorted(second + (UnitType.CROWN,))))
+                    if is_live(signature[0]) and is_live(signature[1]):
+                        found.append(signature)
+    return found
+
+class SliceLayout:
+    """
+    How the states of one signature are indexed.
+    Units are ordered player 1 then player 2, each by unit type; a slice is an
+    array of shape (2, 64 per mobile unit..., HP level per unit...), indexed
+    by side to move (player - 1), mobile squares and hits taken.
+    """
+    def __init__(self, signature: Signature):
+        self.signature = signature
+        self.name = signature_name(signature)
+        self.units: List[Tuple[UnitType, int]] = [(unit_type, player) for player, units in ((1, signature[0]), (2, signature[1]))
+                                                  for unit_type in units]
+        self.fixed = [index for index, (unit_type, _) in enumerate(self.units) if unit_type not in MOBILE_TYPES]
+        self.mobile = [index for index, (unit_type, _) in enumerate(self.units) if unit_type in MOBILE_TYPES]
+        self.levels = [HP_LEVELS[unit_type] for unit_type, _ in self.units]
+        self.shape = (2,) + (NUM_SQUARES,) * len(self.mobile) + tuple(self.levels)
+        self.entries = int(np.prod(self.shape))
+        self.directory_size = ZONE_SIZE ** len(self.fixed)
+
+    def directory_index(self, fixed_squares: Sequence[int]) -> int:
+        """Directory position of a placement of the fixed units."""
+        index = 0
+        for unit, square in zip(self.fixed, fixed_squares):
+            index = index * ZONE_SIZE + ZONE_INDEX[self.units[unit][1]][square]
+        return index
+
+    def canonical_slices(self) -> List[Tuple[int, ...]]:
+        """Every placement of the fixed units that is stored: distinct squares, canonical orientation."""
+        zones = [zone_squares(self.units[unit][1]) for unit in self.fixed]
+        slices = []
+        for squares in itertools.product(*zones):
+            if len(set(squares)) == len(squares) and squares <= tuple(MIRROR[list(squares)]):
+                slices.append(squares)
+        return slices
+
+    def without(self, unit: int) -> 'SliceLayout':
+        """Layout of the signature left after `unit` is destroyed."""
+        first, second = list(self.signature[0]), list(self.signature[1])
+        unit_type, player = self.units[unit]
+        (first if player == 1 else second).remove(unit_type)
+        return SliceLayout((tuple(first), tuple(second)))
+
+def decode_scores(codes: np.ndarray) -> np.ndarray:
+    """Turn value codes into signed scores: BIG - plies for wins, plies - BIG for losses, 0 for draws."""
+    codes = codes.astype(np.int32)
+    return np.where(codes == 0, 0, np.where(codes < BIG, BIG - codes, codes - 2 * BIG)).astype(np.int16)
+
+def encode_scores(scores: np.ndarray) -> np.ndarray:
+    """Inverse of decode_scores()."""
+    scores = scores.astype(np.int32)
+    return np.where(scores > 0, BIG - scores, np.where(scores < 0, 2 * BIG + scores, 0)).astype(np.uint16)
+
+def _back_up(scores: np.ndarray) -> np.ndarray:
+    """Scores of the successor's side to move, seen from the player one ply earlier."""
+    return np.sign(scores) - scores
+
+class Tablebase:
+    """
+    Read-only, memory-mapped access to one signature's file.
+    probe() reads a single value code, so a lookup costs O(1) no matter how
+    large the file is and nothing is loaded up front.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_length = FILE_HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+        self.header = json.loads(self._map[FILE_HEADER.size:FILE_HEADER.size + header_length])
+        self.layout = SliceLayout(parse_signature(self.header['signature']))
+        self.directory_offset = self.header['directory_offset']
+        self.data_offset = self.header['data_offset']
+        self._directory = memoryview(self._map)[self.directory_offset:self.data_offset].cast('I')
+        self._codes = memoryview(self._map)[self.data_offset:].cast('H')
+        # Mixed-radix strides of a slice, in value codes
+        self._strides = [int(np.prod(self.layout.shape[axis + 1:])) for axis in range(len(self.layout.shape))]
+
+    def slot(self, fixed_squares: Sequence[int]) -> Optional[int]:
+        """Slot of a stored, canonical slice."""
+        slot = self._directory[self.layout.directory_index(fixed_squares)]
+        return None if slot == NO_SLICE else slot
+
+    def slice_scores(self, fixed_squares: Sequence[int], player: int) -> Optional[np.ndarray]:
+        """Decoded scores of one slice for `player` to move, mirrored from the stored slice if needed."""
+        mirrored = tuple(int(MIRROR[square]) for square in fixed_squares)
+        flip = mirrored < tuple(fixed_squares)
+        slot = self.slot(mirrored if flip else fixed_squares)
+        if slot is None:
+            return None
+        entries = self.layout.entries
+        codes = np.frombuffer(self._map, dtype=np.uint16, count=entries,
+                              offset=self.data_offset + 2 * slot * entries).reshape(self.layout.shape)
+        scores = decode_scores(codes[player - 1])
+        if flip:
+            for axis in range(len(self.layout.mobile)):
+                scores = np.take(scores, MIRROR, axis=axis)
+        return scores
+
+    def probe_units(self, units: Iterable, player: int) -> Optional[Tuple[int, int]]:
+        """(result, plies) for `player` to move among `units` of this signature.
+
+        result is 1 for a forced win, -1 for a forced loss and 0 for a draw;
+        None means the position is not covered (a slice not generated, or HP
+        that is not a whole number of hits from full).
+        """
+        layout = self.layout
+        remaining = {}
+        for unit in units:
+            remaining.setdefault((unit.unit_type, unit.player), []).append(unit)
+        ordered = []
+        for key in layout.units:
+            if not remaining.get(key):
+                return None
+            ordered.append(remaining[key].pop())
+
+        squares = [unit.position[1] * BOARD_SIZE + unit.position[0] for unit in ordered]
+        fixed = [squares[unit] for unit in layout.fixed]
+        mirrored = [mirror_square(square) for square in fixed]
+        if mirrored < fixed:
+            squares = [mirror_square(square) for square in squares]
+            fixed = mirrored
+        slot = self.slot(fixed)
+        if slot is None:
+            return None
+
+        index = (player - 1) * self._strides[0]
+        for axis, unit in enumerate(layout.mobile, 1):
+            index += squares[unit] * self._strides[axis]
+        for axis, unit in enumerate(ordered, 1 + len(layout.mobile)):
+            hits, rest = divmod(unit.max_hp - unit.hp, HIT_DAMAGE)
+            if rest:
+                return None
+            index += hits * self._strides[axis]
+        code = self._codes[slot * layout.entries + index]
+        if code == 0:
+            return 0, 0
+        return (1, code) if code < BIG else (-1, code - BIG)
+
+    def close(self) -> None:
+        self._directory.release()
+        self._codes.release()
+        self._map.close()
+        self._file.close()
+
+class TablebaseSet:
+    """
+    Every tablebase file in a directory, looked up by the signature of a position.
+    Agents call probe(engine); positions with more units than max_units, or
+    with healers, are simply not covered.
+    """
+    def __init__(self, directory: str):
+        self.tables: Dict[str, Tablebase] = {}
+        for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+            if name.endswith(FILE_SUFFIX):
+                table = Tablebase(os.path.join(directory, name))
+                self.tables[table.layout.name] = table
+        self.max_units = max((len(table.layout.units) for table in self.tables.values()), default=0)
+
+    def probe(self, engine) -> Optional[Tuple[int, int]]:
+        """(result, plies) for the side to move in a GameEngine, or None if no table covers it."""
+        if engine.state not in (GameState.PLAYER_1_TURN, GameState.PLAYER_2_TURN) or len(engine.units) > self.max_units:
+            return None
+        units = {1: [], 2: []}
+        for unit in engine.units.values():
+            if unit.unit_type not in TYPE_LETTERS:
+                return None
+            units[unit.player].append(unit.unit_type)
+        table = self.tables.get(signature_name((tuple(sorted(units[1])), tuple(sorted(units[2])))))
+        if table is None:
+            return None
+        return table.probe_units(engine.units.values(), engine.current_player)
+
+def table_path(directory: str, layout: SliceLayout) -> str:
+    return os.path.join(directory, layout.name + FILE_SUFFIX)
+
+def _solve_slice(layout: SliceLayout, fixed_squares: Sequence[int], directory: str) -> np.ndarray:
+    """Solve one slice by iterating the game's rules backwards from its end states to a fixed point.
+
+    States are laid out as rows (mobile unit squares) by columns (hits taken).
+    Which rows can make each move or attack, and which row and column it
+    leads to, never changes, so those gathers are built once; each pass then
+    backs every state up from its successors. Wins and losses reach a state
+    once everything they depend on is settled, so the number of passes is the
+    longest forced result plus one.
+    """
+    m = len(layout.mobile)
+    rows = NUM_SQUARES ** m
+    columns = int(np.prod(layout.levels))
+    fixed_at = dict(zip(layout.fixed, fixed_squares))
+    mobile_axis = {unit: axis for axis, unit in enumerate(layout.mobile)}
+    row_strides = [NUM_SQUARES ** (m - 1 - axis) for axis in range(m)]
+    column_strides = [int(np.prod(layout.levels[unit + 1:])) for unit in range(len(layout.units))]
+    squares = [index.reshape(-1) for index in np.indices((NUM_SQUARES,) * m)]
+    hits = [index.reshape(-1) for index in np.indices(layout.levels)]
+
+    valid = np.ones(rows, dtype=bool)
+    for axis in range(m):
+        valid &= ~np.isin(squares[axis], fixed_squares)
+        for other in range(axis):
+            valid &= squares[axis] != squares[other]
+
+    # (player, legal rows, successor rows, successor columns or None, dying columns, death scores)
+    actions = []
+    can_act = {1: np.zeros(rows, dtype=bool), 2: np.zeros(rows, dtype=bool)}
+    sub_tables: Dict[str, Tablebase] = {}
+
+    def death_scores(unit: int, legal: np.ndarray, dying: np.ndarray) -> np.ndarray:
+        """Scores, for the unit's owner to move, of the smaller signature left once `unit` is destroyed."""
+        owner = layout.units[unit][1]
+        sub_layout = layout.without(unit)
+        if sub_layout.name not in sub_tables:
+            sub_tables[sub_layout.name] = Tablebase(table_path(directory, sub_layout))
+        sub_fixed = [fixed_at[other] for other in layout.fixed if other != unit]
+        scores = sub_tables[sub_layout.name].slice_scores(sub_fixed, owner)
+        if scores is None:
+            raise ValueError(f"{sub_layout.name} has no slice for {sub_fixed}; generate it first")
+        scores = scores.reshape(NUM_SQUARES ** len(sub_layout.mobile), -1)
+        sub_rows = np.zeros(len(legal), dtype=np.int64)
+        for other in sub_layout.mobile:
+            original = other + (other >= unit)
+            sub_rows = sub_rows * NUM_SQUARES + squares[mobile_axis[original]][legal]
+        sub_columns = np.zeros(len(dying), dtype=np.int64)
+        for other in range(len(layout.units)):
+            if other != unit:
+                sub_columns = sub_columns * layout.levels[other] + hits[other][dying]
+        return scores[np.ix_(sub_rows, sub_columns)]
+
+    for unit in layout.mobile:
+        unit_type, player = layout.units[unit]
+        axis = mobile_axis[unit]
+        for direction in MOVE_DIRECTIONS[unit_type]:
+            target = NEIGHBOUR[squares[axis], DIRECTION_INDEX[direction]]
+            legal = valid & (target >= 0) & ~np.isin(target, fixed_squares)
+            for other in layout.mobile:
+                if other != unit:
+                    legal &= target != squares[mobile_axis[other]]
+            legal = np.flatnonzero(legal)
+            can_act[player][legal] = True
+            successor_rows = legal + (target[legal] - squares[axis][legal]) * row_strides[axis]
+            actions.append((player, legal, successor_rows, None, None, None))
+        for direction in ATTACK_DIRECTIONS[unit_type]:
+            target = NEIGHBOUR[squares[axis], DIRECTION_INDEX[direction]]
+            for enemy, (enemy_type, owner) in enumerate(layout.units):
+                if owner == player:
+                    continue
+                enemy_square = fixed_at[enemy] if enemy in fixed_at else squares[mobile_axis[enemy]]
+                legal = np.flatnonzero(valid & (target == enemy_square))
+                if not len(legal):
+                    continue
+                can_act[player][legal] = True
+                last_hit = hits[enemy] == layout.levels[enemy] - 1
+                successor_columns = np.arange(columns) + np.where(last_hit, 0, column_strides[enemy])
+                dying = np.flatnonzero(last_hit)
+                attackers_left = sum(1 for other_type, other_owner in layout.units
+                                     if other_owner == owner and other_type in ATTACKER_TYPES)
+                if enemy_type == UnitType.CROWN or (enemy_type in ATTACKER_TYPES and attackers_left == 1):
+                    death = BIG - 1  # the attack wins the game
+                else:
+                    death = _back_up(death_scores(enemy, legal, dying))
+                actions.append((player, legal, legal, successor_columns, dying, death))
+    for table in sub_tables.values():
+        table.close()
+    passing = {player: np.flatnonzero(valid & ~can_act[player]) for player in (1, 2)}
+
+    values = np.zeros((2, rows, columns), dtype=np.int16)
+    while True:
+        backed_up = _back_up(values)
+        updated = np.full_like(values, -BIG)
+        for player, legal, successor_rows, successor_columns, dying, death in actions:
+            successors = backed_up[2 - player][successor_rows]
+            if successor_columns is not None:
+                successors = successors[:, successor_columns]
+                successors[:, dying] = death
+            best = updated[player - 1]
+            best[legal] = np.maximum(best[legal], successors)
+        for player in (1, 2):
+            # A side without any legal action passes
+            updated[player - 1][passing[player]] = backed_up[2 - player][passing[player]]
+        updated[:, ~valid] = 0
+        if np.array_equal(updated, values):
+            break
+        values = updated
+    return values.reshape(layout.shape)
+
+def _solve_task(task: Tuple[str, str, Tuple[int, ...], int, int]) -> Tuple[int, float]:
+    """Worker entry point: solve one slice and write it into its slot of the file."""
+    directory, name, fixed_squares, slot, data_offset = task
+    start = time.perf_counter()
+    layout = SliceLayout(parse_signature(name))
+    values = _solve_slice(layout, fixed_squares, directory)
+    codes = np.memmap(table_path(directory, layout), dtype=np.uint16, mode='r+',
+                      offset=data_offset + 2 * slot * layout.entries, shape=(layout.entries,))
+    codes[:] = encode_scores(values).reshape(-1)
+    codes.flush()
+    del codes
+    return slot, time.perf_counter() - start
+
+def generate(layout: SliceLayout, directory: str, workers: Optional[int] = None,
+             slices: Optional[Sequence[Tuple[int, ...]]] = None) -> None:
+    """Write the tablebase for one signature, solving its slices on a process pool.
+
+    The tables of every signature it can turn into by losing a wall or a
+    spare attacker must already exist in `directory`. `slices` restricts the
+    file to some canonical placements of the fixed units (all by default).
+    """
+    if slices is None:
+        slices = layout.canonical_slices()
+    directory_codes = np.full(layout.directory_size, NO_SLICE, dtype=np.uint32)
+    for slot, fixed_squares in enumerate(slices):
+        directory_codes[layout.directory_index(fixed_squares)] = slot
+
+    # Reserve room for the offsets in the header, then align both sections
+    header = {'signature': layout.name, 'slices': len(slices), 'entries': layout.entries,
+              'directory_offset': 0, 'data_offset': 0}
+    header_length = len(json.dumps(header)) + 32
+    directory_offset = -(-(FILE_HEADER.size + header_length) // 8) * 8
+    data_offset = -(-(directory_offset + directory_codes.nbytes) // 8) * 8
+    header.update(directory_offset=directory_offset, data_offset=data_offset)
+    header_bytes = json.dumps(header).encode().ljust(header_length)
+
+    path = table_path(directory, layout)
+    with open(path, 'wb') as table_file:
+        table_file.write(FILE_HEADER.pack(MAGIC, VERSION, header_length) + header_bytes)
+        table_file.seek(directory_offset)
+        table_file.write(directory_codes.tobytes())
+        table_file.truncate(data_offset + 2 * len(slices) * layout.entries)
+
+    tasks = [(directory, layout.name, fixed_squares, slot, data_offset) for slot, fixed_squares in enumerate(slices)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        for done, (slot, seconds) in enumerate(pool.imap_unordered(_solve_task, tasks), 1):
+            if done % 10 == 0 or done == len(tasks):
+                print(f"  {layout.name}: {done}/{len(tasks)} slices, last {seconds:.1f}s, "
+                      f"{time.perf_counter() - start:.0f}s total")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate endgame tablebases by retrograde analysis")
+    parser.add_argument('--units', type=int, default=4, help="solve every signature with up to this many units")
+    parser.add_argument('--signature', action='append', default=None,
+                        help="solve only these signatures (e.g. SC-KC); smaller ones they reduce to must exist")
+    parser.add_argument('--out', default='tablebases', help="directory for the table files")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--limit', type=int, default=None, help="solve only the first N slices of each signature")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    chosen = [parse_signature(name) for name in args.signature] if args.signature else signatures(args.units)
+    for signature in sorted(chosen, key=lambda s: len(s[0]) + len(s[1])):
+        layout = SliceLayout(signature)
+        slices = layout.canonical_slices()[:args.limit]
+        print(f"{layout.name}: {len(slices)} slices x {layout.entries} states = "
+              f"{2 * len(slices) * layout.entries / 2 ** 20:.1f} MiB")
+        generate(layout, args.out, args.workers, slices)
+
+if __name__ == "__main__":
+    main()
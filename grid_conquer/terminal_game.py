@@ -1,5 +1,5 @@
-from game_engine import GameEngine
-from constants import UnitType, GameState, BOARD_SIZE
+from .game_engine import GameEngine
+from .constants import UnitType, GameState, BOARD_SIZE
 from typing import Tuple, Optional
 
 class TerminalGame:
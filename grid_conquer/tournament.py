@@ -0,0 +1,231 @@
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from .constants import BOARD_SIZE, GameState, UnitType, DEFAULT_LAYOUT, PLACEMENT_ORDER
+from .game_engine import GameEngine
+from .agents import AGENT_NAMES, create_agent
+from .records import GameRecordWriter, encode_action, encode_game
+
+# Options that decide how a scheduled game is played; a run only resumes results played with the same values
+RUN_OPTIONS = ('seed', 'placement', 'time_limit', 'iterations', 'max_plies')
+
+def random_layout(rng: random.Random) -> List[Tuple[UnitType, Tuple[int, int], int]]:
+    """Pick random starting squares for both players inside their placement zones."""
+    layout = []
+    for player, rows in ((1, range(0, 3)), (2, range(BOARD_SIZE - 3, BOARD_SIZE))):
+        squares = rng.sample([(x, y) for y in rows for x in range(BOARD_SIZE)], len(PLACEMENT_ORDER))
+        layout.extend((unit_type, square, player) for unit_type, square in zip(PLACEMENT_ORDER, squares))
+    return layout
+
+def play_game(task: dict) -> dict:
+    """Play one full game from placement to game over and return the result record."""
+    rng = random.Random(task['seed'])
+    layout = random_layout(rng) if task['placement'] == 'random' else DEFAULT_LAYOUT
+
+    # Placement alternates between the players one unit at a time, like the UIs
+    layout = sorted(layout, key=lambda entry: (PLACEMENT_ORDER.index(entry[0]), entry[2]))
+    engine = GameEngine()
+    engine.place_layout(layout)
+
+    agents = {
+        player: create_agent(name, engine, time_limit=task['time_limit'],
+                             iterations=task['iterations'], seed=rng.getrandbits(32))
+        for player, name in ((1, task['player1']), (2, task['player2']))
+    }
+    start = time.perf_counter()
+    plies = 0
+    passes = 0
+    actions = []
+    while engine.state != GameState.GAME_OVER and plies < task['max_plies'] and passes < 2:
+        action = agents[engine.current_player].choose_action()
+        if task['record']:
+            actions.append(encode_action(action))
+        if action is None:
+            engine.end_turn()
+            passes += 1
+        else:
+            engine.apply_action(action)
+            passes = 0
+        plies += 1
+
+    result = {
+        'game': task['game'],
+        'player1': task['player1'],
+        'player2': task['player2'],
+        'winner': engine.winner if engine.state == GameState.GAME_OVER else 0,
+        'plies': plies,
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+    if task['record']:
+        result['encoded'] = encode_game(layout, actions, engine.winner)
+    return result
+
+def schedule(agent_names: List[str], games_per_pair: int, args) -> List[dict]:
+    """Build the round-robin game list; each pair swaps colours every other game."""
+    tasks = []
+    for first, second in itertools.combinations(agent_names, 2):
+        for index in range(games_per_pair):
+            player1, player2 = (first, second) if index % 2 == 0 else (second, first)
+            tasks.append({
+                'game': len(tasks),
+                'player1': player1,
+                'player2': player2,
+                'seed': args.seed * 1000003 + len(tasks),
+                'placement': args.placement,
+                'time_limit': args.time_limit,
+                'iterations': args.iterations,
+                'max_plies': args.max_plies,
+                'record': args.record is not None
+            })
+    return tasks
+
+def run_parameters(args) -> dict:
+    """The RUN_OPTIONS values of a run, as stored on the first line of its results file."""
+    return {name: getattr(args, name) for name in RUN_OPTIONS}
+
+def load_results(path: str) -> Tuple[Optional[dict], Dict[int, dict]]:
+    """Read the run parameters and the results already streamed to `path` by an earlier run."""
+    parameters = None
+    results = {}
+    if os.path.exists(path):
+        with open(path) as results_file:
+            for line in results_file:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    if 'run' in record:
+                        parameters = record['run']
+                    else:
+                        # A replayed game's later row replaces the earlier one
+                        results[record['game']] = record
+    return parameters, results
+
+def score_for(record: dict, agent: str) -> float:
+    """Score of one agent in a game: 1 win, 0.5 draw, 0 loss."""
+    if record['winner'] == 0:
+        return 0.5
+    winner = record['player1'] if record['winner'] == 1 else record['player2']
+    return 1.0 if winner == agent else 0.0
+
+def win_rate_interval(score: float, games: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a win rate (draws counted as half a win)."""
+    if games == 0:
+        return 0.0, 1.0
+    rate = score / games
+    denominator = 1 + z * z / games
+    centre = (rate + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+def elo_ratings(records: List[dict], agent_names: List[str], iterations: int = 500) -> Dict[str, float]:
+    """Fit Elo ratings to all results by maximum likelihood, centred on 1500."""
+    ratings = {name: 0.0 for name in agent_names}
+    for _ in range(iterations):
+        # Each agent also gets one virtual draw against an average opponent,
+        # which keeps the ratings of unbeaten or winless agents finite
+        errors = {name: 0.5 - 1.0 / (1.0 + 10 ** (-ratings[name] / 400.0)) for name in agent_names}
+        games = {name: 1 for name in agent_names}
+        for record in records:
+            a, b = record['player1'], record['player2']
+            error = score_for(record, a) - 1.0 / (1.0 + 10 ** ((ratings[b] - ratings[a]) / 400.0))
+            errors[a] += error
+            errors[b] -= error
+            games[a] += 1
+            games[b] += 1
+        largest_step = 0.0
+        for name in agent_names:
+            step = 64.0 * errors[name] / games[name]
+            ratings[name] += step
+            largest_step = max(largest_step, abs(step))
+        if largest_step < 0.01:
+            break
+    mean = sum(ratings.values()) / len(ratings)
+    return {name: 1500.0 + rating - mean for name, rating in ratings.items()}
+
+def print_report(records: List[dict], agent_names: List[str]) -> None:
+    """Print per-agent and per-pair win rates with 95% intervals, plus Elo ratings."""
+    ratings = elo_ratings(records, agent_names)
+    print(f"\n{'Agent':<12}{'Elo':>8}{'Games':>8}{'Score':>8}{'Win rate':>10}   95% CI")
+    for name in sorted(agent_names, key=lambda n: -ratings[n]):
+        played = [r for r in records if name in (r['player1'], r['player2'])]
+        score = sum(score_for(r, name) for r in played)
+        low, high = win_rate_interval(score, len(played))
+        rate = score / len(played) if played else 0.0
+        print(f"{name:<12}{ratings[name]:>8.0f}{len(played):>8}{score:>8.1f}{rate:>10.3f}   [{low:.3f}, {high:.3f}]")
+
+    print(f"\n{'Pair':<26}{'Games':>8}{'Win rate':>10}   95% CI")
+    for first, second in itertools.combinations(agent_names, 2):
+        played = [r for r in records if {r['player1'], r['player2']} == {first, second}]
+        if not played:
+            continue
+        score = sum(score_for(r, first) for r in played)
+        low, high = win_rate_interval(score, len(played))
+        print(f"{first + ' vs ' + second:<26}{len(played):>8}{score / len(played):>10.3f}   [{low:.3f}, {high:.3f}]")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless self-play tournament between Grid Conquer agents")
+    parser.add_argument('agents', nargs='+', choices=AGENT_NAMES, help="agents to play round-robin")
+    parser.add_argument('--games', type=int, default=20, help="games per pair of agents")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--time-limit', type=float, default=0.1, help="seconds per move for search agents")
+    parser.add_argument('--iterations', type=int, default=None, help="MCTS iterations per move")
+    parser.add_argument('--max-plies', type=int, default=300, help="plies before a game is scored a draw")
+    parser.add_argument('--placement', choices=('default', 'random'), default='random')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--results', default='tournament_results.jsonl',
+                        help="JSON-lines file results are streamed to; existing results are resumed")
+    parser.add_argument('--record', default=None,
+                        help="also append every game's moves to this binary record file (see records.py)")
+    args = parser.parse_args(argv)
+
+    agent_names = list(dict.fromkeys(args.agents))
+    if len(agent_names) < 2:
+        parser.error("need at least two different agents")
+    tasks = schedule(agent_names, args.games, args)
+    parameters, previous = load_results(args.results)
+    if (parameters is not None or previous) and parameters != run_parameters(args):
+        parser.error(f"{args.results} holds results played with {parameters or 'unrecorded options'}, "
+                     f"not {run_parameters(args)}; resume with the same options or pick another --results file")
+    writer = GameRecordWriter(args.record) if args.record else None
+    # Earlier results only count if they were played by the same pairing, and when
+    # recording, if their game made it into the record file after the result row
+    results = {game: record for game, record in previous.items()
+               if game < len(tasks) and (record['player1'], record['player2'])
+               == (tasks[game]['player1'], tasks[game]['player2'])
+               and not (writer and record.get('record', -1) >= writer.games)}
+    pending = [task for task in tasks if task['game'] not in results]
+    print(f"{len(tasks)} games scheduled, {len(tasks) - len(pending)} already done, "
+          f"running {len(pending)} on {args.workers} workers")
+
+    start = time.perf_counter()
+    with open(args.results, 'a') as results_file, multiprocessing.Pool(args.workers) as pool:
+        if results_file.tell() == 0:
+            results_file.write(json.dumps({'run': run_parameters(args)}) + '\n')
+        for done, record in enumerate(pool.imap_unordered(play_game, pending), 1):
+            encoded = record.pop('encoded', None)
+            if writer:
+                record['record'] = writer.games
+            # Stream each result to disk as it arrives so an interrupted run can resume. The
+            # row is committed before its game is recorded, so a game interrupted in between
+            # is replayed on resume instead of being recorded twice
+            results_file.write(json.dumps(record) + '\n')
+            results_file.flush()
+            if writer:
+                writer.write_encoded(encoded)
+            results[record['game']] = record
+            if done % 10 == 0 or done == len(pending):
+                elapsed = time.perf_counter() - start
+                print(f"{done}/{len(pending)} games, {done / elapsed:.2f} games/s")
+    if writer:
+        writer.close()
+
+    print_report(list(results.values()), agent_names)
+
+if __name__ == "__main__":
+    main()
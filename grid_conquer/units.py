@@ -0,0 +1,136 @@
+from functools import lru_cache
+from typing import Collection, Dict, List, Tuple, Optional
+from .constants import (
+    UnitType, UNIT_STATS, BOARD_SIZE,
+    MOVE_DIRECTIONS, ATTACK_DIRECTIONS, HEAL_DIRECTIONS
+)
+
+Ray = Tuple[Tuple[int, int], ...]
+RayTable = Dict[UnitType, Dict[Tuple[int, int], Tuple[Ray, ...]]]
+
+def _build_rays(directions, steps: int, board_size: int) -> Dict[Tuple[int, int], Tuple[Ray, ...]]:
+    """For every square, list the on-board squares along each direction, nearest first."""
+    table = {}
+    for x in range(board_size):
+        for y in range(board_size):
+            rays = []
+            for dx, dy in directions:
+                ray = tuple((x + dx * i, y + dy * i) for i in range(1, steps + 1)
+                            if 0 <= x + dx * i < board_size and 0 <= y + dy * i < board_size)
+                if ray:
+                    rays.append(ray)
+            table[(x, y)] = tuple(rays)
+    return table
+
+@lru_cache(maxsize=None)
+def ruleset_tables(board_size: int) -> Tuple[RayTable, RayTable, RayTable]:
+    """Build the move, attack and heal ray tables for every unit type and square."""
+    move_table = {t: _build_rays(MOVE_DIRECTIONS[t], UNIT_STATS[t]['move_range'], board_size) for t in UnitType}
+    attack_table = {t: _build_rays(ATTACK_DIRECTIONS[t], UNIT_STATS[t]['attack_range'], board_size) for t in UnitType}
+    heal_table = {t: _build_rays(HEAL_DIRECTIONS[t], 1, board_size) for t in UnitType}
+    return move_table, attack_table, heal_table
+
+# Tables for the standard board, built once at import
+MOVE_TABLE, ATTACK_TABLE, HEAL_TABLE = ruleset_tables(BOARD_SIZE)
+
+class Unit:
+    # Fixed slots instead of a per-instance __dict__: units are created and
+    # copied constantly during simulation
+    __slots__ = ('unit_type', 'player', 'position', 'hp', 'max_hp', 'alive')
+
+    def __init__(self, unit_type: UnitType, player: int, position: Tuple[int, int]):
+        self.unit_type = unit_type
+        self.player = player  # 1 or 2
+        self.position = position
+        stats = UNIT_STATS[unit_type]
+        self.hp = stats['hp']
+        self.max_hp = stats['hp']
+        self.alive = True
+
+    def __repr__(self) -> str:
+        return (f"Unit(unit_type={self.unit_type!r}, player={self.player}, position={self.position}, "
+                f"hp={self.hp}, max_hp={self.max_hp}, alive={self.alive})")
+
+    def __copy__(self) -> 'Unit':
+        clone = Unit.__new__(Unit)
+        clone.unit_type = self.unit_type
+        clone.player = self.player
+        clone.position = self.position
+        clone.hp = self.hp
+        clone.max_hp = self.max_hp
+        clone.alive = self.alive
+        return clone
+
+    def __deepcopy__(self, memo: dict) -> 'Unit':
+        # Every field is immutable, so a shallow copy is already a deep one
+        clone = self.__copy__()
+        memo[id(self)] = clone
+        return clone
+
+    def get_valid_moves(self, board_size: int, occupied_positions: Collection[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Get all valid moves for this unit based on its type and current position."""
+        if not self.alive:
+            return []
+
+        move_table = MOVE_TABLE if board_size == BOARD_SIZE else ruleset_tables(board_size)[0]
+        valid_moves = []
+        for ray in move_table[self.unit_type][self.position]:
+            for square in ray:
+                # Stop at the first occupied square
+                if square in occupied_positions:
+                    break
+                valid_moves.append(square)
+
+        return valid_moves
+
+    def get_valid_attacks(self, board_size: int, enemy_positions: Collection[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Get all valid attack positions for this unit."""
+        if not self.alive:
+            return []
+
+        attack_table = ATTACK_TABLE if board_size == BOARD_SIZE else ruleset_tables(board_size)[1]
+        valid_attacks = []
+        for ray in attack_table[self.unit_type][self.position]:
+            for square in ray:
+                # Hit the first enemy along the ray
+                if square in enemy_positions:
+                    valid_attacks.append(square)
+                    break
+
+        return valid_attacks
+
+    def get_valid_heals(self, board_size: int, friendly_positions: Collection[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Get all valid heal positions for this unit (Healer only)."""
+        if not self.alive:
+            return []
+
+        heal_table = HEAL_TABLE if board_size == BOARD_SIZE else ruleset_tables(board_size)[2]
+        return [ray[0] for ray in heal_table[self.unit_type][self.position]
+                if ray[0] in friendly_positions]
+
+    def move(self, new_position: Tuple[int, int]) -> None:
+        """Move the unit to a new position."""
+        self.position = new_position
+
+    def take_damage(self, damage: int) -> None:
+        """Apply damage to the unit."""
+        self.hp = max(0, self.hp - damage)
+        if self.hp == 0:
+            self.alive = False
+
+    def heal(self, amount: int) -> None:
+        """Heal the unit."""
+        if self.unit_type == UnitType.HEALER:
+            self.hp = max(0, self.hp - amount)  # Healer takes damage when healing
+            if self.hp == 0:
+                self.alive = False
+        else:
+            self.hp = min(self.max_hp, self.hp + amount)
+
+    def get_symbol(self) -> str:
+        """Get the unit's display symbol."""
+        return UNIT_STATS[self.unit_type]['symbol']
+
+    def get_attack_damage(self) -> int:
+        """Get the unit's attack damage."""
+        return UNIT_STATS[self.unit_type]['attack'] 
\ No newline at end of file
@@ -0,0 +1,35 @@
+import random
+from typing import Tuple
+from .constants import BOARD_SIZE, UnitType, UNIT_STATS
+
+# HP is folded into buckets of this size; every HP value the rules produce is a
+# multiple of 10 (max HP, 50 damage, 30 heal), so buckets never merge two real values
+HP_BUCKET_SIZE = 10
+HP_BUCKETS = max(stats['hp'] for stats in UNIT_STATS.values()) // HP_BUCKET_SIZE + 1
+
+_rng = random.Random(0x6772696463)  # fixed seed so hashes agree across processes and runs
+
+# UNIT_KEYS[unit_type][player][square][hp_bucket]; index 0 of the player axis is unused
+UNIT_KEYS = {
+    unit_type: [[[_rng.getrandbits(64) for _ in range(HP_BUCKETS)]
+                 for _ in range(BOARD_SIZE * BOARD_SIZE)]
+                for _ in range(3)]
+    for unit_type in UnitType
+}
+
+# XORed in when player 2 is to move
+SIDE_KEY = _rng.getrandbits(64)
+
+def unit_key(unit_type: UnitType, player: int, position: Tuple[int, int], hp: int) -> int:
+    """Get the hash key for one unit on one square with a given HP."""
+    x, y = position
+    return UNIT_KEYS[unit_type][player][y * BOARD_SIZE + x][hp // HP_BUCKET_SIZE]
+
+def mirror_unit_key(unit_type: UnitType, player: int, position: Tuple[int, int], hp: int) -> int:
+    """Get the key the same unit has in the left-right mirror image of the board."""
+    x, y = position
+    return UNIT_KEYS[unit_type][player][y * BOARD_SIZE + BOARD_SIZE - 1 - x][hp // HP_BUCKET_SIZE]
+
+def side_key(player: int) -> int:
+    """Get the hash key for the side to move."""
+    return SIDE_KEY if player == 2 else 0
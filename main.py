@@ -1,6 +1,8 @@
-from ui import GameUI
-
 def main():
+    # Imported here so the engine modules can be imported without pygame
+    from grid_conquer.gui import GameUI
+    from grid_conquer.instrumentation import enable_from_environment
+    enable_from_environment()
     game = GameUI()
     game.run()
 